@@ -1,40 +1,178 @@
 #!/usr/bin/env python3
 
+import argparse
+import io
+import sys
+import time
+from contextlib import nullcontext
 from functools import reduce
 from itertools import pairwise
+from typing import IO, Iterable, Iterator
 
 import aoc
+import numpy as np
 from more_itertools import triplewise
 
+CHUNK_BYTES = 16 * 2**20
+
 
 class Window:
-    """A sliding window that can be filled, checked for fullness and its sum taken."""
+    """A sliding window that can be filled, checked for fullness and its sum taken.
+
+    The values live in a ring buffer and the sum is kept up to date as values
+    come and go, so every operation takes constant time.
+    """
 
-    cache: list[int | None]
-    head = 0
+    cache: list[int]
+    head: int
+    count: int
+    total: int
 
     def __init__(self, size: int):
-        self.cache = [None] * size
+        self.cache = [0] * size
+        self.head = 0
+        self.count = 0
+        self.total = 0
 
     def add(self, value: int) -> None:
+        if self.count == len(self.cache):
+            self.total -= self.cache[self.head]
+        else:
+            self.count += 1
         self.cache[self.head] = value
+        self.total += value
         self.head = self.head + 1 if self.head + 1 != len(self.cache) else 0
 
-    def is_full(self) -> None:
-        try:
-            self.get_sum()
-            return True
-        except AttributeError:
-            return False
+    def is_full(self) -> bool:
+        return self.count == len(self.cache)
 
-    def get_sum(self) -> float:
-        if None in self.cache:
+    def get_sum(self) -> int:
+        if self.count != len(self.cache):
             raise AttributeError("No element in window yet")
-        return sum(self.cache)
+        return self.total
+
+
+def read_depths(stream: IO[str]) -> Iterator[int]:
+    """Read depths one line at a time, so a stream can be endless."""
+    for line in stream:
+        if line.strip():
+            yield int(line)
+
+
+def stream_increases(
+    depths: Iterable[int], size: int = 3
+) -> Iterator[tuple[int, int, int]]:
+    """Count the increases of single depths and of window sums on the fly.
+
+    Only the current window is kept, so memory does not grow with the stream.
+
+    Yields:
+        tuple[int, int, int]: The readings so far and the part 1 and part 2
+            counts after every reading.
+    """
+    window = Window(size)
+    previous = None
+    single_increases = window_increases = 0
+    for readings, depth in enumerate(depths, 1):
+        if previous is not None and depth > previous:
+            single_increases += 1
+        previous = depth
+        if window.is_full():
+            before = window.total
+            window.add(depth)
+            if window.total > before:
+                window_increases += 1
+        else:
+            window.add(depth)
+        yield readings, single_increases, window_increases
+
+
+def stream(path: str, every: int) -> None:
+    """Print the running counts of a file or of stdin for `-` with throughput."""
+    with nullcontext(sys.stdin) if path == "-" else open(path) as file:
+        start = time.perf_counter()
+        counts = (0, 0, 0)
+        for counts in stream_increases(read_depths(file)):
+            if every and counts[0] % every == 0:
+                report(*counts, time.perf_counter() - start)
+        if not every or counts[0] % every:
+            report(*counts, time.perf_counter() - start)
+
+
+def report(
+    readings: int, part1: int, part2: int, seconds: float, how: str = "streamed"
+) -> None:
+    print(f"Part 1 ({how})>", part1)
+    print(f"Part 2 ({how})>", part2)
+    print(f"Readings> {readings} at {readings / max(seconds, 1e-9):,.0f} per second")
+
+
+def read_depth_chunks(
+    file: IO[bytes], chunk_bytes: int = CHUNK_BYTES
+) -> Iterator[np.ndarray]:
+    """Parse a file of depths into int arrays of about `chunk_bytes` each.
+
+    Every chunk ends at a line break, the partial line is kept for the next.
+    """
+    rest = b""
+    while block := file.read(chunk_bytes):
+        block = rest + block
+        end = block.rfind(b"\n") + 1
+        block, rest = block[:end], block[end:]
+        if block.strip():
+            yield np.fromstring(block, dtype=np.int64, sep=" ")
+    if rest.strip():
+        yield np.fromstring(rest, dtype=np.int64, sep=" ")
 
 
-def main() -> None:
+def _increases(depths: np.ndarray, shift: int, first_new: int) -> int:
+    """Count the depths deeper than the one `shift` before them, from the
+    index first_new on as the earlier ones were counted with the last chunk.
+    """
+    start = max(shift, first_new)
+    return np.count_nonzero(depths[start:] > depths[start - shift : -shift])
+
+
+def numpy_increases(chunks: Iterable[np.ndarray], size: int = 3) -> tuple[int, int]:
+    """Count the increases of single depths and of window sums with shifted
+    array comparisons. Windows of `size` share all but their outer depths, so
+    a window sum increases exactly when depths[i + size] > depths[i].
+
+    The last `size` depths of a chunk are carried over to compare across the
+    border, so only one chunk is in memory at a time.
+
+    Returns:
+        tuple[int, int]: The part 1 and part 2 counts.
+    """
+    carry = np.empty(0, dtype=np.int64)
+    single_increases = window_increases = 0
+    for chunk in chunks:
+        depths = np.concatenate([carry, chunk])
+        single_increases += _increases(depths, 1, len(carry))
+        window_increases += _increases(depths, size, len(carry))
+        carry = depths[-size:]
+    return single_increases, window_increases
+
+
+def numpy_batch(path: str, chunk_bytes: int) -> None:
+    """Print the counts of an archived file of depths with throughput."""
+    start = time.perf_counter()
+    readings = 0
+
+    def counted(chunks: Iterator[np.ndarray]) -> Iterator[np.ndarray]:
+        nonlocal readings
+        for chunk in chunks:
+            readings += len(chunk)
+            yield chunk
+
+    with open(path, "rb") as file:
+        part1, part2 = numpy_increases(counted(read_depth_chunks(file, chunk_bytes)))
+    report(readings, part1, part2, time.perf_counter() - start, how="numpy")
+
+
+def main(timer: aoc.Timer) -> None:
     numbers = aoc.get_integers()
+    timer.mark("Read input")
 
     # Part 1 --- loop based
     current_number = None
@@ -45,10 +183,12 @@ def main() -> None:
                 increment_counter += 1
         current_number = number
     print("Part 1 (loop based)>", increment_counter)
+    timer.mark("Part 1 loop")
 
     # Part 1 --- itertools based
     increment_counter = sum(before < after for before, after in pairwise(numbers))
     print("Part 1 (itertools based)>", increment_counter)
+    timer.mark("Part 1 itertools")
 
     # Part 2 --- custom sliding window class based
     window = Window(3)
@@ -62,6 +202,7 @@ def main() -> None:
             if window.get_sum() > current_number:
                 increment_counter += 1
     print("Part 2 (class based)>", increment_counter)
+    timer.mark("Part 2 class")
 
     # Part 2 --- more_itertools based
     current_number = None
@@ -73,12 +214,14 @@ def main() -> None:
                 increment_counter += 1
         current_number = new_sum
     print("Part 2 (more_itertools based)>", increment_counter)
+    timer.mark("Part 2 more_itertools")
 
     # Part 2 --- more more_itertools based
     increment_counter = sum(
         [sum(before) < sum(after) for before, after in pairwise(triplewise(numbers))]
     )
     print("Part 2 (more more_itertools based)>", increment_counter)
+    timer.mark("Part 2 pairwise")
 
     # Part 2 --- evil math
     # a+b+c<b+c+d = a<d
@@ -86,6 +229,7 @@ def main() -> None:
         [before[0] < after[2] for before, after in pairwise(triplewise(numbers))]
     )
     print("Part 2 (more more_itertools based, evil math)>", increment_counter)
+    timer.mark("Part 2 evil math")
 
     # Part 2 --- more more_itertools based, presummed
     increment_counter = sum(
@@ -97,6 +241,7 @@ def main() -> None:
         ]
     )
     print("Part 2 (more more_itertools based, presummed)>", increment_counter)
+    timer.mark("Part 2 presummed")
 
     # Part 2 --- more more_itertools based with reduce
     increment_counter = reduce(
@@ -108,7 +253,52 @@ def main() -> None:
         "Part 2 (more more_itertools based with reduce)>",
         increment_counter,
     )
+    timer.mark("Part 2 reduce")
+
+    # Both parts --- numpy based, comparing shifted arrays
+    depths = np.array(numbers)
+    print("Part 1 (numpy based)>", np.count_nonzero(depths[1:] > depths[:-1]))
+    print("Part 2 (numpy based)>", np.count_nonzero(depths[3:] > depths[:-3]))
+    timer.mark("Both numpy")
+
+    # Both parts --- numpy based in chunks, small ones to cross many borders
+    part1, part2 = numpy_increases(read_depth_chunks(io.BytesIO(aoc.get()), 1024))
+    print("Part 1 (numpy based, chunked)>", part1)
+    print("Part 2 (numpy based, chunked)>", part2)
+    timer.last_mark("Both numpy chunked")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--stream",
+        metavar="PATH",
+        help="count the depths of a file as they are read, - for stdin",
+    )
+    parser.add_argument(
+        "--every",
+        type=int,
+        default=1_000_000,
+        metavar="N",
+        help="also print the running counts every N streamed readings",
+    )
+    parser.add_argument(
+        "--chunked",
+        metavar="PATH",
+        help="count the depths of an archived file with numpy, chunk by chunk",
+    )
+    parser.add_argument(
+        "--chunk-bytes",
+        type=int,
+        default=CHUNK_BYTES,
+        metavar="N",
+        help="how many bytes of the file are parsed at once",
+    )
+    options = parser.parse_args()
+    if options.stream:
+        stream(options.stream, options.every)
+    elif options.chunked:
+        numpy_batch(options.chunked, options.chunk_bytes)
+    else:
+        with aoc.Timer() as timer:
+            main(timer)
@@ -1,50 +1,142 @@
 #!/usr/bin/env python3
 
-from functools import reduce
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 
 import aoc
 import numpy as np
 
+# below this many commands the processes cost more than they save
+PARALLEL_THRESHOLD = 1_000_000
+WORKERS = 1
+TRAJECTORY = False
+
+# model using homogeneous state transition matrices
+OUTPUT_MATRICES = {
+    1: np.array([[1, 0, 0], [0, 1, 0]]),  # state is (position, depth, 1)
+    2: np.array([[0, 1, 0, 0], [0, 0, 1, 0]]),  # state is (aim, position, depth, 1)
+}
+INITIAL_STATES = {1: np.array([0, 0, 1]), 2: np.array([0, 0, 0, 1])}
+
+
+def transition_matrices(commands: list[tuple[str, int]], part: int) -> np.ndarray:
+    """Stack the homogeneous state transition matrix of every command.
+
+    Returns:
+        np.ndarray: The matrices in command order, shaped (n, k, k).
+    """
+    letters = np.array([cmd for cmd, _ in commands])
+    dists = np.array([dist for _, dist in commands], dtype=np.int64)
+    forward = np.where(letters == "f", dists, 0)
+    down = np.where(letters == "d", dists, 0) - np.where(letters == "u", dists, 0)
+    size = len(INITIAL_STATES[part])
+    matrices = np.zeros((len(commands), size, size), dtype=np.int64)
+    matrices[:, range(size), range(size)] = 1
+    if part == 1:
+        matrices[:, 0, 2] = forward
+        matrices[:, 1, 2] = down
+    else:
+        matrices[:, 0, 3] = down
+        matrices[:, 1, 3] = forward
+        matrices[:, 2, 0] = forward
+    return matrices
+
+
+def tree_product(matrices: np.ndarray) -> np.ndarray:
+    """Multiply the stacked matrices, later ones on the left, in log n rounds.
+
+    Every round multiplies neighbouring pairs in one batched matmul, which is
+    possible because matrix products are associative.
+    """
+    while len(matrices) > 1:
+        odd = matrices[-1:] if len(matrices) % 2 else matrices[:0]
+        pairs = len(matrices) // 2 * 2
+        matrices = np.concatenate([matrices[1:pairs:2] @ matrices[0:pairs:2], odd])
+    return matrices[0]
+
+
+def prefix_products(matrices: np.ndarray) -> np.ndarray:
+    """Every product of the first i + 1 matrices, by recursive doubling.
+
+    After the round with the shift s every entry holds the product of the
+    up to 2s matrices ending at it, so log n batched matmuls are needed.
+    """
+    products = matrices.copy()
+    shift = 1
+    while shift < len(products):
+        products[shift:] = products[shift:] @ products[:-shift]
+        shift *= 2
+    return products
+
+
+def _chunks(matrices: np.ndarray, workers: int) -> list[np.ndarray]:
+    return np.array_split(matrices, workers) if workers > 1 else [matrices]
+
+
+def combine(matrices: np.ndarray, workers: int = 1) -> np.ndarray:
+    """The product of all matrices, with the chunks reduced in parallel."""
+    if workers <= 1 or len(matrices) < PARALLEL_THRESHOLD:
+        return tree_product(matrices)
+    with ProcessPoolExecutor(workers) as pool:
+        totals = list(pool.map(tree_product, _chunks(matrices, workers)))
+    return tree_product(np.stack(totals))
+
+
+def scan(matrices: np.ndarray, workers: int = 1) -> np.ndarray:
+    """Like prefix_products with the chunks scanned in parallel. Afterwards
+    every chunk is moved behind the product of all chunks before it.
+    """
+    if workers <= 1 or len(matrices) < PARALLEL_THRESHOLD:
+        return prefix_products(matrices)
+    with ProcessPoolExecutor(workers) as pool:
+        chunks = list(pool.map(prefix_products, _chunks(matrices, workers)))
+    carry = np.identity(matrices.shape[1], dtype=matrices.dtype)
+    for chunk in chunks:
+        chunk[:] = chunk @ carry
+        carry = chunk[-1]
+    return np.concatenate(chunks)
+
+
+def final_position(
+    commands: list[tuple[str, int]], part: int, workers: int = 1
+) -> np.ndarray:
+    """The (position, depth) after all commands."""
+    total = combine(transition_matrices(commands, part), workers)
+    return OUTPUT_MATRICES[part] @ total @ INITIAL_STATES[part]
+
+
+def trajectory(
+    commands: list[tuple[str, int]], part: int, workers: int = 1
+) -> np.ndarray:
+    """The (position, depth) after every command, shaped (n, 2)."""
+    products = scan(transition_matrices(commands, part), workers)
+    return products @ INITIAL_STATES[part] @ OUTPUT_MATRICES[part].T
+
 
 def main() -> None:
     commands = aoc.Parse().regex_lines(r"(.).+ (\d+)", (str, int)).get()
-    # model using homogeneous state transition matrices
-    print(
-        reduce(
-            lambda a, b: np.array(a) @ np.array(b),
-            [
-                [[1, 0, 0], [0, 1, 0]],  # output matrix
-                *[
-                    [
-                        [1, 0, dist if cmd == "f" else 0],
-                        [0, 1, dist if cmd == "d" else -dist if cmd == "u" else 0],
-                        [0, 0, 1],
-                    ]  # homogeneous state transition matrix
-                    for cmd, dist in reversed(commands)
-                ],
-                [0, 0, 1],  # initial state
-            ],
-        ).prod()
-    )
-    print(
-        reduce(
-            lambda a, b: np.array(a) @ np.array(b),
-            [
-                [[0, 1, 0, 0], [0, 0, 1, 0]],  # output matrix
-                *[
-                    [
-                        [1, 0, 0, dist if cmd == "d" else -dist if cmd == "u" else 0],
-                        [0, 1, 0, dist if cmd == "f" else 0],
-                        [dist if cmd == "f" else 0, 0, 1, 0],
-                        [0, 0, 0, 1],
-                    ]  # homogeneous state transition matrix
-                    for cmd, dist in reversed(commands)
-                ],
-                [0, 0, 0, 1],  # initial state
-            ],
-        ).prod()
-    )
+    print(final_position(commands, 1, WORKERS).prod())
+    print(final_position(commands, 2, WORKERS).prod())
+    if TRAJECTORY:
+        for part in (1, 2):
+            depths = trajectory(commands, part, WORKERS)[:, 1]
+            deepest = depths.argmax()
+            print(f"part {part}: deepest {depths[deepest]} after command {deepest + 1}")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="processes to combine the matrices of long command logs with",
+    )
+    parser.add_argument(
+        "--trajectory",
+        action="store_true",
+        help="also scan for the position after every command and show the deepest",
+    )
+    args = parser.parse_args()
+    WORKERS, TRAJECTORY = args.workers, args.trajectory
     main()
@@ -1,49 +1,71 @@
 #!/usr/bin/env python3
 
-from functools import reduce
-
 import aoc
 import numpy as np
 
 
-def find_most_common_digits(numbers: list[int]) -> list[int]:
-    counts = reduce(lambda a, b: np.array(a) + np.array(b), numbers)
-    total = len(numbers)
-    return [int(count / total >= 0.5) for count in counts]
+def pack(digits: np.ndarray) -> np.ndarray:
+    """Turn a (n, bits) matrix of 0s and 1s into one uint64 per row."""
+    rows, width = digits.shape
+    assert width <= 64, "only words of up to 64 bits can be packed"
+    packed = np.packbits(digits, axis=1)  # left aligned, big endian bytes
+    words = np.zeros((rows, 8), dtype=np.uint8)
+    words[:, : packed.shape[1]] = packed
+    return words.view(">u8").ravel().astype(np.uint64) >> np.uint64(64 - width)
 
 
-def find_least_common_digits(numbers: list[int]) -> list[int]:
-    counts = reduce(lambda a, b: np.array(a) + np.array(b), numbers)
-    total = len(numbers)
-    return [int(count / total < 0.5 and count != 0) for count in counts]
+def power_rates(digits: np.ndarray) -> tuple[int, int]:
+    """The gamma and epsilon rates from the digit counts of every column.
 
+    Ties count as 1 being the most common digit. The least common digit has to
+    occur, so a column of only 0s or only 1s gives a 0 in epsilon, which is
+    why epsilon is not simply the complement of gamma.
+    """
+    rows = len(digits)
+    counts = digits.sum(axis=0, dtype=np.int64)
+    gamma = int("".join("1" if 2 * count >= rows else "0" for count in counts), 2)
+    epsilon = int("".join("1" if 0 < 2 * count < rows else "0" for count in counts), 2)
+    return gamma, epsilon
 
-def main() -> None:
-    lines = aoc.get_lines()
 
-    # convert to array of array of 0s or 1s
-    numbers = [[int(d) for d in line] for line in lines]
+def rating(values: np.ndarray, width: int, most_common: bool) -> int:
+    """Filter the sorted report bit by bit down to one value.
+
+    The candidates left always share their leading bits, so they are a range
+    of the sorted values. The ones with a 1 at the next bit are the end of that
+    range, where a binary search finds them.
+    """
+    low, high = 0, len(values)
+    prefix = 0
+    for bit in reversed(range(width)):
+        if high - low == 1:
+            break
+        split = low + int(
+            np.searchsorted(values[low:high], np.uint64(prefix | 1 << bit))
+        )
+        zeros, ones = split - low, high - split
+        if most_common:
+            keep_ones = ones >= zeros
+        else:
+            keep_ones = zeros == 0 or 0 < ones < zeros
+        if keep_ones:
+            low, prefix = split, prefix | 1 << bit
+        else:
+            high = split
+    return int(values[low])
 
-    gamma = int("".join([str(dig) for dig in find_most_common_digits(numbers)]), 2)
-    epsilon = int("".join([str(dig) for dig in find_least_common_digits(numbers)]), 2)
-    print(gamma * epsilon)
 
-    oxygen_candidates = numbers
-    index = 0
-    while len(oxygen_candidates) > 1:
-        digs = find_most_common_digits(oxygen_candidates)
-        oxygen_candidates = [oc for oc in oxygen_candidates if oc[index] == digs[index]]
-        index += 1
-    oxygen_generator = int("".join([str(digit) for digit in oxygen_candidates[0]]), 2)
-
-    co2_candidates = numbers
-    index = 0
-    while len(co2_candidates) > 1:
-        digs = find_least_common_digits(co2_candidates)
-        co2_candidates = [cc for cc in co2_candidates if cc[index] == digs[index]]
-        index += 1
-    co2_scrubbers = int("".join([str(digit) for digit in co2_candidates[0]]), 2)
+def main() -> None:
+    # a (n, bits) array of 0s and 1s
+    digits = aoc.get_dense_int_array()
+    width = digits.shape[1]
+
+    gamma, epsilon = power_rates(digits)
+    print(gamma * epsilon)
 
+    values = np.sort(pack(digits))
+    oxygen_generator = rating(values, width, most_common=True)
+    co2_scrubbers = rating(values, width, most_common=False)
     print(oxygen_generator * co2_scrubbers)
 
 
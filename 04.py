@@ -1,51 +1,77 @@
 #!/usr/bin/env python3
 
 import aoc
+import numpy as np
 
-# Type alias
-BOARD = list[list[int | None]]
 
+def read_boards(lines: list[str]) -> np.ndarray:
+    """Read the blocks of numbers into one (boards, size, size) array."""
+    size = len(lines[0].split())
+    return np.fromstring(" ".join(lines), dtype=np.int64, sep=" ").reshape(
+        -1, size, size
+    )
 
-def board_sum(board: BOARD) -> int:
-    """Sum of all unplayed numbers on a board."""
-    return sum(sum(number or 0 for number in line) for line in board)
 
+def play(boards: np.ndarray, draws: list[int]) -> tuple[np.ndarray, ...]:
+    """Play bingo on all boards at once.
 
-def board_complete(board: BOARD) -> bool:
-    """Is a board completed."""
-    line_complete = any(all(number is None for number in line) for line in board)
-    column_complete = any(
-        all(line[column_index] is None for line in board)
-        for column_index in range(len(board[0]))
-    )
-    return line_complete or column_complete
+    An index from every number to the cells holding it is built up front, and
+    every board counts the marked cells of its rows and columns. A draw then
+    only touches the cells with its number instead of every board.
+
+    Returns:
+        tuple[np.ndarray, ...]: The boards in the order they win, ties in
+            board order, and for every board the index of the draw it won
+            with, -1 if it never does, and its score.
+    """
+    count, size, _ = boards.shape
+    cells = boards.ravel()
+    if 0 <= cells.min() and cells.max() < 2**16:
+        cells = cells.astype(np.uint16)  # sorts with a radix sort, 10 × faster
+    # the cells sorted by number, the cells of a number are a range of these
+    index = np.argsort(cells, kind="stable")
+    numbers = cells[index]
+    row_hits = np.zeros((count, size), dtype=np.int32)
+    column_hits = np.zeros((count, size), dtype=np.int32)
+    unmarked = boards.sum(axis=(1, 2))
+    winning_draw = np.full(count, -1)
+    scores = np.zeros(count, dtype=np.int64)
+    lows = np.searchsorted(numbers, draws, side="left").tolist()
+    highs = np.searchsorted(numbers, draws, side="right").tolist()
+    order = []
+    drawn = set()
+    for turn, (number, low, high) in enumerate(zip(draws, lows, highs)):
+        if number in drawn:
+            continue
+        drawn.add(number)
+        # the stable sort keeps the boards of a number in ascending order
+        board, cell = np.divmod(index[low:high], size * size)
+        row, column = np.divmod(cell, size)
+        if np.any(board[1:] == board[:-1]):  # a board holds the number twice
+            np.subtract.at(unmarked, board, number)
+            np.add.at(row_hits, (board, row), 1)
+            np.add.at(column_hits, (board, column), 1)
+        else:  # much faster, but only right without repeated boards
+            unmarked[board] -= number
+            row_hits[board, row] += 1
+            column_hits[board, column] += 1
+        complete = (row_hits[board, row] == size) | (column_hits[board, column] == size)
+        winners = board[complete]
+        winners = winners[np.diff(winners, prepend=-1) != 0]
+        winners = winners[winning_draw[winners] < 0]
+        winning_draw[winners] = turn
+        scores[winners] = unmarked[winners] * number
+        order.append(winners)
+    return np.concatenate([np.zeros(0, dtype=int), *order]), winning_draw, scores
 
 
 def main() -> None:
     instructions, lines = aoc.Parse().comma_integers().remaining_lines()
+    boards = read_boards([line for line in lines if line])
 
-    # read boards
-    boards: list[BOARD] = []
-    current_board: BOARD = []
-    for line in [*lines, ""]:
-        if line:
-            current_board.append([int(number) for number in line.split(" ") if number])
-        else:
-            boards.append(current_board)
-            current_board = []
-
-    for instruction in instructions:
-        # Mark played numbers as `None`
-        for board_index, board in enumerate(boards):
-            for line_index, line in enumerate(board):
-                for column_index, number in enumerate(line):
-                    if number == instruction:
-                        boards[board_index][line_index][column_index] = None
-        # Check for completed boards
-        for board in boards:
-            if board_complete(board):
-                print(instruction * board_sum(board))
-                boards.remove(board)
+    order, _, scores = play(boards, instructions)
+    for board in order:
+        print(scores[board])
 
 
 if __name__ == "__main__":
@@ -1,71 +1,32 @@
 #!/usr/bin/env python3
 
 import aoc
+import numpy as np
 
-POINT = tuple[int, int]
 
-
-def omni_range(start: int, end: int) -> list[int]:
-    """A range that can increment or decrement and includes both ends."""
-    if start < end:
-        return list(range(start, end + 1))
-    else:
-        return list(reversed(range(end, start + 1)))
+def overlaps(x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray) -> int:
+    """Count the points covered by at least two of the given lines."""
+    dx, dy = np.sign(x2 - x1), np.sign(y2 - y1)
+    lengths = np.maximum(abs(x2 - x1), abs(y2 - y1)) + 1
+    # every point gets the index of its line and its step along that line
+    line_index = np.repeat(np.arange(len(lengths)), lengths)
+    step = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    xs = x1[line_index] + step * dx[line_index]
+    ys = y1[line_index] + step * dy[line_index]
+    hits = np.bincount(ys * (xs.max() + 1) + xs)
+    return np.count_nonzero(hits > 1)
 
 
 def main() -> None:
-    lines = (
+    x1, y1, x2, y2 = (
         aoc.Parse()
-        .regex_lines(r"(\d+),(\d+) -> (\d+),(\d+)", (int, int, int, int))
+        .regex_columns(r"(\d+),(\d+) -> (\d+),(\d+)", (int, int, int, int))
         .get()
     )
 
-    horizontal_lines: list[tuple[POINT, POINT]] = []
-    vertical_lines: list[tuple[POINT, POINT]] = []
-    diagonal_lines: list[tuple[POINT, POINT]] = []
-
-    for x1, y1, x2, y2 in lines:
-        point1, point2 = (x1, y1), (x2, y2)
-        points = (point1, point2)
-        if y1 == y2:
-            horizontal_lines.append(points)
-        elif x1 == x2:
-            vertical_lines.append(points)
-        else:
-            diagonal_lines.append(points)
-
-    hit_points: dict[int, dict[int, int]] = {}
-
-    def status_report() -> None:
-        print(
-            sum(
-                sum(point > 1 for point in line.values())
-                for line in hit_points.values()
-            )
-        )
-
-    def register(x: int, y: int) -> None:
-        hit_points[y] = hit_points.get(y, {})
-        hit_points[y][x] = hit_points[y].get(x, 0) + 1
-
-    for horizontal_line in horizontal_lines:
-        (x1, y), (x2, _) = horizontal_line
-        for x in omni_range(x1, x2):
-            register(x, y)
-
-    for vertical_line in vertical_lines:
-        (x, y1), (_, y2) = vertical_line
-        for y in omni_range(y1, y2):
-            register(x, y)
-
-    status_report()
-
-    for diagonal_line in diagonal_lines:
-        (x1, y1), (x2, y2) = diagonal_line
-        for x, y in zip(omni_range(x1, x2), omni_range(y1, y2)):
-            register(x, y)
-
-    status_report()
+    straight = (x1 == x2) | (y1 == y2)
+    print(overlaps(x1[straight], y1[straight], x2[straight], y2[straight]))
+    print(overlaps(x1, y1, x2, y2))
 
 
 if __name__ == "__main__":
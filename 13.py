@@ -2,43 +2,28 @@
 
 import aoc
 import numpy as np
-import pytesseract
-from PIL import Image
 
 
 def main(timer: aoc.Timer) -> None:
-    points, instructions = (
+    (xs, ys), (axes, distances) = (
         aoc.Parse()
-        .regex_lines(r"(\d+),(\d+)", (int, int))
-        .regex_lines(r"fold along (.)=(\d+)", (str, int))
+        .regex_columns(r"(\d+),(\d+)", (int, int))
+        .regex_columns(r"fold along (.)=(\d+)", (str, int))
     )
 
-    max_x, max_y = [max(point[column] for point in points) for column in [0, 1]]
-    paper = [[0 for x in range(max_x + 1)] for y in range(max_y + 1)]
+    paper = np.zeros((ys.max() + 1, xs.max() + 1), dtype=bool)
+    paper[ys, xs] = True
 
-    for x, y in points:
-        paper[y][x] = True
-
-    for axis, distance in instructions:
-        distance = int(distance)
-        alt = lambda x: distance + (distance - x)  # the point getting mirrored onto x
-        if axis == "x":
-            paper = [
-                [
-                    dot or (alt(x) < len(line) and line[alt(x)])
-                    for x, dot in enumerate(line)
-                ][: distance + 1]
-                for line in paper
-            ]
-        else:  # if axis == "y":
-            paper = [
-                [
-                    dot or (alt(y) < len(paper) and paper[alt(y)][x])
-                    for x, dot in enumerate(line)
-                ]
-                for y, line in enumerate(paper)
-            ][: distance + 1]
-        print(sum(sum(line) for line in paper))
+    for axis, distance in zip(axes, distances):
+        if axis == "y":
+            paper = paper.T
+        # mirror everything right of the fold onto the columns left of it
+        mirrored = paper[:, distance + 1 : 2 * distance + 1][:, ::-1]
+        paper = paper[:, : distance + 1].copy()
+        paper[:, distance - mirrored.shape[1] : distance] |= mirrored
+        if axis == "y":
+            paper = paper.T
+        print(paper.sum())
 
     timer.mark()
 
@@ -47,10 +32,12 @@ def main(timer: aoc.Timer) -> None:
 
     timer.mark()
 
+    # only the OCR needs these, and they are slow to import
+    import pytesseract
+    from PIL import Image
+
     # convert to image
-    image = Image.fromarray(
-        np.array([np.array([255 * (not c) for c in l], dtype=np.uint8) for l in paper])
-    )
+    image = Image.fromarray((255 * ~paper).astype(np.uint8))
     # padding
     image2 = Image.new(image.mode, (len(paper[0]) + 4, len(paper) + 4), 255)
     image2.paste(image, (2, 2))
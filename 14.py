@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 
 import itertools
-from functools import cache
 
 import aoc
 import numpy as np
@@ -24,7 +23,7 @@ def main(timer: aoc.Timer) -> None:
         list(set(letter for letter in "".join(aoc.get_str()) if letter.isalpha()))
     )
 
-    @cache
+    @aoc.persistent_cache
     def expand_pair_counts(sequence: str, depth: int) -> list[int]:
         """AC -> [1, 0, 3, 7]; frequencies for each letter according to the
         order in `letters`. The first character will not be counted to prevent
@@ -1,66 +1,42 @@
 #!/usr/bin/env python3
 
-import heapq
-import itertools
-import sys
-from typing import Callable
-
 import aoc
+import numpy as np
 
 
-def astar(cave_map: list[list[int]], heuristic: Callable[[int, int], float]) -> int:
-    height, width = len(cave_map), len(cave_map[0])
-    smallest_distance = [[sys.maxsize for x in range(width)] for y in range(height)]
-
-    nodes_to_visit = []
-    heapq.heappush(nodes_to_visit, (0, (0, 0, 0)))
-
-    while nodes_to_visit:
-        _, (x, y, distance) = heapq.heappop(nodes_to_visit)
-        if distance >= smallest_distance[y][x]:
-            continue
-        if x == width - 1 and y == height - 1:
-            return distance
-        smallest_distance[y][x] = distance
-        for x2, y2 in [[x - 1, y], [x + 1, y], [x, y - 1], [x, y + 1]]:
-            if 0 <= x2 < width and 0 <= y2 < height:
-                heur = heuristic(x2, y2)
-                node_distance = distance + cave_map[y2][x2]
-                heapq.heappush(
-                    nodes_to_visit, (node_distance + heur, (x2, y2, node_distance))
-                )
-
-
-def dijkstra(cave_map: list[list[int]]) -> int:
-    return astar(cave_map, heuristic=lambda *_: 0)
-
-
-def astar_distance(cave_map: list[list[int]], weight: float = 1) -> int:
-    height, width = len(cave_map), len(cave_map[0])
-    return astar(cave_map, heuristic=lambda x, y: width - x + height - y)
+def manhattan_heuristic(cave_map: np.ndarray, weight: float = 1) -> list[float]:
+    """The distance of every cell to the bottom right corner, by flat index."""
+    height, width = cave_map.shape
+    ys, xs = np.indices(cave_map.shape)
+    return ((width - xs + height - ys) * weight).ravel().tolist()
 
 
 def main(timer: aoc.Timer) -> None:
-    cave_map = aoc.get_dense_int_matrix()
+    cave_map = aoc.get_dense_int_array().astype(int)
+    graph = aoc.Graph.from_grid(cave_map)
+    goal = cave_map.size - 1
     timer.mark("Read Matrix")
-    print(dijkstra(cave_map))
+    print(aoc.dijkstra(graph, 0, goal))
     timer.mark("1 Dijkstra")
-    print(astar_distance(cave_map))
+    print(aoc.astar(graph, 0, goal, manhattan_heuristic(cave_map)))
     timer.mark("1 A*")
-    height, width = len(cave_map), len(cave_map[0])
-    new_cave_map = [[0 for _ in range(width * 5)] for _ in range(height * 5)]
-    for ypage, xpage in itertools.product(range(5), range(5)):
-        offset = xpage + ypage
-        for internal_y, internal_x in itertools.product(range(height), range(width)):
-            x = xpage * width + internal_x
-            y = ypage * height + internal_y
-            new_cave_map[y][x] = (cave_map[internal_y][internal_x] + offset - 1) % 9 + 1
-            # correct wrapping in [1,9] achieved by (i - 1) % 9 + 1
+    print(aoc.bucket_dijkstra(graph, 0, goal, max_weight=9))
+    timer.mark("1 Buckets")
+    height, width = cave_map.shape
+    offsets = (
+        np.add.outer(np.arange(5), np.arange(5)).repeat(height, 0).repeat(width, 1)
+    )
+    # correct wrapping in [1,9] achieved by (i - 1) % 9 + 1
+    new_cave_map = (np.tile(cave_map, (5, 5)) + offsets - 1) % 9 + 1
+    graph = aoc.Graph.from_grid(new_cave_map)
+    goal = new_cave_map.size - 1
     timer.mark("Build Matrix")
-    print(dijkstra(new_cave_map))
+    print(aoc.dijkstra(graph, 0, goal))
     timer.mark("2 Dijkstra")
-    print(astar_distance(new_cave_map))
-    timer.last_mark("2 A*")
+    print(aoc.astar(graph, 0, goal, manhattan_heuristic(new_cave_map)))
+    timer.mark("2 A*")
+    print(aoc.bucket_dijkstra(graph, 0, goal, max_weight=9))
+    timer.last_mark("2 Buckets")
 
 
 if __name__ == "__main__":
@@ -5,9 +5,7 @@ from itertools import product
 from math import ceil, sqrt
 
 import aoc
-import numpy as np
 from joblib import Parallel, delayed
-from PIL import Image
 
 
 def main(timer: aoc.Timer) -> None:
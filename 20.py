@@ -1,56 +1,32 @@
 #!/usr/bin/env python3
 
-import itertools
-from functools import reduce
-
 import aoc
-import more_itertools
 import numpy as np
-from PIL import Image
-from tqdm import tqdm
 
 RELEVANTS = [2, 50]
 PADDING = 1
+SHOW_IMAGES = False
+# the 3 × 3 pixels around a pixel read as a binary number, top left first
+BIT_WEIGHTS = 2 ** np.arange(8, -1, -1).reshape(3, 3)
 
 
 def main(timer: aoc.Timer) -> None:
-    instruction, map_code = aoc.Parse().line().remaining_lines()
-    algo = [c == "#" for c in instruction.strip()]
-    seafloor = np.zeros(
-        (len(map_code) + 2 * PADDING, len(map_code[0]) + 2 * PADDING),
-        dtype=int,
-    )
-    for row_index, row in enumerate(map_code):
-        for column_index, c in enumerate(row):
-            seafloor[row_index + PADDING, column_index + PADDING] = c == "#"
-
-    for i in tqdm(range(max(RELEVANTS))):
-        height, width = seafloor.shape
-        # this dynamically grows by a padding of 1 each round
-        seafloor = np.array(
-            [
-                [
-                    algo[
-                        reduce(
-                            lambda a, b: a << 1 | b,
-                            (
-                                seafloor[
-                                    min(max(0, y_), height - 1),
-                                    min(max(0, x_), width - 1),
-                                ]
-                                for y_, x_ in itertools.product(ys, xs)
-                            ),
-                        )
-                    ]
-                    for xs in more_itertools.triplewise(range(-2, width + 2))
-                ]
-                for ys in more_itertools.triplewise(range(-2, height + 2))
-            ],
-            dtype=int,
-        )
+    instruction, map_code = aoc.Parse().line().char_grid()
+    algo = np.array([c == "#" for c in instruction.strip()], dtype=int)
+    seafloor = np.pad(map_code == ord("#"), PADDING).astype(int)
+
+    for i in range(max(RELEVANTS)):
+        # this dynamically grows by a padding of 1 each round, the infinite
+        # rest of the image is like the border as all of it is lit or dark
+        grid = aoc.Grid(np.pad(seafloor, 1, mode="edge"))
+        windows = grid.windows(mode="edge")
+        seafloor = algo[np.einsum("yxij,ij->yx", windows, BIT_WEIGHTS)]
         if i + 1 in RELEVANTS:
-            tqdm.write(f"{i + 1: 2d}: {np.sum(seafloor)}")
-            Image.fromarray(seafloor.astype(bool)).show()
+            print(f"{i + 1: 2d}: {np.sum(seafloor)}")
+            if SHOW_IMAGES:
+                from PIL import Image
+
+                Image.fromarray(seafloor.astype(bool)).show()
             if i + 1 != max(RELEVANTS):
                 timer.mark()
 
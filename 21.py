@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 
-from functools import cache
 from math import floor
 
 import aoc
@@ -13,7 +12,8 @@ def shiftmod(n: int) -> int:
 PART2THRESHOLD = 21
 
 
-@cache
+# there are about 110 000 game states, the bound only matters for other rules
+@aoc.persistent_cache(maxsize=200_000)
 def victories(
     player1_pawn: int,
     player2_pawn: int,
@@ -90,6 +90,7 @@ def main(timer: aoc.Timer) -> None:
 
     timer.mark()
 
+    timer.track(victories)
     print(max(victories(player1_pawn, player2_pawn)))
 
 
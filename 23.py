@@ -2,10 +2,9 @@
 
 from __future__ import annotations
 
-import heapq
 import itertools
 from dataclasses import dataclass
-from functools import cache
+from typing import Iterator
 
 import aoc
 import huepy
@@ -205,7 +204,7 @@ def pprint_world_state(amphipods: list[Amphipod], label: any = "") -> None:
     print(huepy.blue("    ╚═══╧═══╧═══╧═══╝"))
 
 
-@cache
+@aoc.persistent_cache
 def nodes_between(start: int, end: int) -> list[int]:
     current_cost = 0
     unchecked_nodes = [(start, [])]
@@ -307,63 +306,44 @@ def lock_homed_amphipods(world: AMPHIPODS) -> None:
                 amphipod.steps_left = 0
 
 
-def optimal_cost(amphipods: list[Amphipod]) -> int | None:
-    paths_to_explore = []
-    known_costs: dict[AMPHIPODS, int] = {}
-
-    def add_world_to_stack(world: list[Amphipod], prior_costs: int = 0):
-        if (best_known_costs := known_costs.get(world)) is not None:
-            if best_known_costs < prior_costs:
-                return
-        occupied_nodes = [a.position for a in world]
-        for amphipod in world:
-            if amphipod.can_move:
-                for node in range(27):
-                    if node == amphipod.position:
-                        continue
-                    if (
-                        amphipod.steps_left == 1
-                        and node_base_color(node) != amphipod.color
-                    ):
-                        continue
-                    if (
-                        reserved_color := node_reserved_color(node)
-                    ) is not None and reserved_color != amphipod.color:
-                        continue
-                    path = nodes_between(amphipod.position, node)
-                    if any(n in occupied_nodes for n in path):
-                        continue
-
-                    additional_costs = len(path) * PRICES[amphipod.color]
-
-                    newstate = (
-                        additional_costs + prior_costs,
-                        world_moving(world, amphipod, node),
-                    )
-                    total_costs, new_world = newstate
-                    if blocks_others(new_world, node):
-                        continue
-
-                    if newstate[1] in known_costs.keys():
-                        if known_costs[newstate[1]] <= newstate[0]:
-                            continue
-
-                    known_costs[newstate[1]] = newstate[0]
-
-                    heapq.heappush(paths_to_explore, newstate)
+def moves(world: AMPHIPODS) -> Iterator[tuple[AMPHIPODS, int]]:
+    """Every world one amphipod move away, with the energy the move takes."""
+    occupied_nodes = [a.position for a in world]
+    for amphipod in world:
+        if amphipod.can_move:
+            for node in range(27):
+                if node == amphipod.position:
+                    continue
+                if amphipod.steps_left == 1 and node_base_color(node) != amphipod.color:
+                    continue
+                if (
+                    reserved_color := node_reserved_color(node)
+                ) is not None and reserved_color != amphipod.color:
+                    continue
+                path = nodes_between(amphipod.position, node)
+                if any(n in occupied_nodes for n in path):
+                    continue
 
-    pprint_world_state(amphipods)
-    add_world_to_stack(amphipods)
-    i = 0
-    while paths_to_explore:
-        costs, explore_world = heapq.heappop(paths_to_explore)
-        if all(a.color in [node_base_color(a.position), "X"] for a in explore_world):
-            pprint_world_state(explore_world)
-            return costs
-        add_world_to_stack(explore_world, costs)
-        i += 1
+                new_world = world_moving(world, amphipod, node)
+                if blocks_others(new_world, node):
+                    continue
 
-    return None
+                yield new_world, len(path) * PRICES[amphipod.color]
+
+
+def is_solved(world: AMPHIPODS) -> bool:
+    return all(a.color in [node_base_color(a.position), "X"] for a in world)
+
+
+def optimal_cost(amphipods: AMPHIPODS) -> int | None:
+    graph = aoc.StateGraph(moves)
+    pprint_world_state(amphipods)
+    costs = aoc.dijkstra(
+        graph, graph.node(amphipods), lambda node: is_solved(graph.states[node])
+    )
+    if costs is not None:
+        pprint_world_state(next(filter(is_solved, graph.states)))
+    return costs
 
 
 def main(timer: aoc.Timer) -> None:
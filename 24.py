@@ -72,7 +72,8 @@ def main(timer: aoc.Timer) -> None:
 
     steps = list(zip(var_as, var_bs, var_cs))
 
-    @cache
+    # the (step, z) states grow with the program, so only keep the recent ones
+    @aoc.persistent_cache(maxsize=1_000_000)
     def solutions_after_step(
         step: int = 0, z: int = 0, max_min: str | None = None
     ) -> list[str]:
@@ -95,6 +96,7 @@ def main(timer: aoc.Timer) -> None:
                     return [min(solutions, key=lambda s: int(s))]
         return solutions
 
+    timer.track(solutions_after_step)
     print(solutions_after_step(max_min="max")[0])
     timer.mark()
     print(solutions_after_step(max_min="min")[0])
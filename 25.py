@@ -2,19 +2,37 @@
 
 import aoc
 import huepy
+import numpy as np
 
+EMPTY, EAST, SOUTH = ord("."), ord(">"), ord("v")
 
-def pprint(state: list[str]) -> None:
-    highlight = (
-        lambda x: huepy.red(x) if x == ">" else huepy.blue(x) if x == "v" else " "
+
+def pprint(state: np.ndarray) -> None:
+    highlight = lambda x: (
+        huepy.red(x) if x == ">" else huepy.blue(x) if x == "v" else " "
     )
     print(
         ("╭" + "─" * len(state[0]) + "╮\n")
-        + "\n".join("│" + "".join((highlight(c) for c in line)) + "│" for line in state)
+        + "\n".join(
+            "│" + "".join((highlight(chr(c)) for c in line)) + "│" for line in state
+        )
         + ("\n╰" + "─" * len(state[0]) + "╯")
     )
 
 
+def move(state: np.ndarray, herd: int, axis: int) -> bool:
+    """Move a herd one step along an axis if the cell in front of it is empty.
+    All cucumbers of a herd decide simultaneously and the map wraps around at
+    its edges. Returns whether any moved.
+    """
+    dy, dx = (1, 0) if axis == 0 else (0, 1)
+    ahead = aoc.Grid(state).shifted(dy, dx, mode="wrap")
+    movers = (state == herd) & (ahead == EMPTY)
+    state[movers] = EMPTY
+    state[aoc.Grid(movers).shifted(-dy, -dx, mode="wrap")] = herd
+    return movers.any()
+
+
 def main(timer: aoc.Timer) -> None:
     example = (
         "v...>>.vv>\n"
@@ -27,42 +45,20 @@ def main(timer: aoc.Timer) -> None:
         "v.v..>>v.v\n"
         "....v..v.>"
     )
-    state = [
-        list(line)
-        for line in aoc.Parse(
+    state = (
+        aoc.Parse(
             # alt=example # to use example code
         )
-        .lines()
+        .char_grid()
         .get()
-    ]
-    width, height = len(state[0]), len(state)
+    )
 
     pprint(state)
     timer.mark("Preprocessing")
-    steps = 0
-    requires_step = True
-    while requires_step:
+    steps = 1
+    # `|` instead of `or` as the south herd has to move even if the east did
+    while move(state, EAST, axis=1) | move(state, SOUTH, axis=0):
         steps += 1
-        requires_step = False
-        new_state = [["." for _ in line] for line in state]
-        for y in range(height):
-            for x in range(width):
-                if state[y][x] == "v":
-                    new_state[y][x] = "v"
-                elif state[y][x] == ">":
-                    new_state[y][x] = "." if state[y][(x + 1) % width] == "." else ">"
-                elif state[y][x] == ".":
-                    new_state[y][x] = ">" if state[y][(x - 1) % width] == ">" else "."
-                requires_step = requires_step or new_state[y][x] != state[y][x]
-        for y in range(height):
-            for x in range(width):
-                if new_state[y][x] == ">":
-                    state[y][x] = ">"
-                elif new_state[y][x] == "v":
-                    state[y][x] = "." if new_state[(y + 1) % height][x] == "." else "v"
-                elif new_state[y][x] == ".":
-                    state[y][x] = "v" if new_state[(y - 1) % height][x] == "v" else "."
-                requires_step = requires_step or new_state[y][x] != state[y][x]
     print(steps)
     timer.mark()
     pprint(state)
@@ -21,9 +21,21 @@ of the following lines:
     aoc.get_integers(1) # integers for day one (one per line)
     aoc.get_comma_integers(1) # get one line of integers separated by commas
     aoc.get_dense_int_matrix(1) # get a 2d matrix of ints with one per character
+    aoc.get_dense_int_array(1) # same but as a 2d numpy uint8 array
+    aoc.get_char_grid(1) # a 2d numpy array of the character codes of a map
+    aoc.get_mmap(1) # memory-mapped input for day one, nothing is read yet
 
     aoc.get_integers() # when called from `01-minimal.py` gets ints for day 1.
 
+To download every input up front, for example on a fresh machine, use
+
+    aoc.prefetch() # all days concurrently over one pooled connection
+
+From asynchronous code the inputs can be awaited instead. This needs aiohttp.
+
+    await aoc.aget(1) # like aoc.get(1)
+    await aoc.aget_many(range(1, 26)) # a list with the bytes of every day
+
 You can also leave out the number and it will get guessed from the file name of
 the main Python file by just taking all the numbers in the file name. So for
 example `day_03.py` or `03-alternate.py` would query day 3; however files like
@@ -46,33 +58,146 @@ would parse a file that looks like
 and write a list of integers into foo, and a list of tuples, here [(1, "a"),
 (2, "b"), ...] into bar.
 
+For very large inputs the file can be memory-mapped instead of read. Pass
+`mmap=True` to Parse and lines will only be located and decoded once a parser
+method consumes them:
+
+    foo = aoc.Parse(mmap=True).integers().get()
+
+Parsed inputs can be cached on disk with `cache=True`. The chain of section
+calls is recorded and every section is stored in a sidecar file next to the
+input. Later runs load the sections from there as long as neither the input
+nor the chain changed:
+
+    lines = aoc.Parse(cache=True).regex_lines(r"(\d+),(\d+)", (int, int)).get()
+
+Maps of digits or characters can be wrapped in a Grid to look at the neighbours
+of all cells at once instead of looping over them:
+
+    grid = aoc.Grid(aoc.get_dense_int_array())
+    low_points = (grid.cells < grid.neighbours(fill=10)).all(axis=0)
+
+Shortest paths are found on integer nodes with flat distance lists. Grids turn
+into a Graph directly, puzzles with too many states to build use a StateGraph:
+
+    graph = aoc.Graph.from_grid(costs)
+    aoc.dijkstra(graph, start=0, goal=costs.size - 1)
+
+Expensive pure functions of a day can keep their results on disk between runs
+with `@aoc.persistent_cache` instead of `@functools.cache`. `@aoc.memoize` only
+keeps them in memory, and both can be limited in size and report their hit
+rate through `timer.track(function)`.
+
 This module also provides timer functionality. Read the documentation for Timer
-below.
+and benchmark below. To see which imports make a day slow to start use
+
+    aoc.startup_report("13.py", budget_ms=150)
+
+The HTTP libraries are only imported once something has to be downloaded, the
+modules for profiling, memory tracking, exports, caches and the runner only
+once those are used.
+
+Running this module runs all days in parallel and prints one combined timing
+report, see runner below:
+
+    python aoc.py # every NN.py
+    python aoc.py 3 12 --workers 2 # only days 3 and 12 with two processes
+
+Days whose script, input and this module are unchanged since their last run
+print their cached output instead of running again, `--force` runs them.
 
 Attributes:
     CACHE_DIRECTORY (TYPE): The directory to put the daily inputs in.
     CACHE_FILE_NAME_TEMPLATE (str): The name template for daily cache files.
     COOKIE_PATH (TYPE): The computed path to the cookie file.
+    CURRENT_DAY (int | None): The day the runner is executing, if any.
+    PREFETCH_WORKERS (int): How many inputs get downloaded at the same time.
     PROJECT_FOLDER (TYPE): The computed directory the main file is in.
+    MAX_CONCURRENT_REQUESTS (int): How many asynchronous requests may be open.
+    PERSISTENT_CACHE_MAX_BYTES (int): The default size limit of the results of
+        persistent caches.
+    PERSISTENT_CACHE_MAX_ENTRIES (int): The default number of results
+        persistent caches keep.
+    REGRESSION_MIN_BYTES (int): How much more peak memory a section has to
+        use before it can count as a regression at all.
+    REGRESSION_MIN_MS (float): The same for the time of a section.
+    REGRESSION_THRESHOLD (float): The relative slowdown against the baseline
+        that counts as a regression, from $AOC_REGRESSION_THRESHOLD.
+    RETRIES (int): How often a failed download is retried.
+    RETRY_BACKOFF (float): The backoff factor between retries in seconds.
+    TIMER_BASELINE (str | None): A timing export to compare against, from
+        $AOC_TIMER_BASELINE.
+    TIMER_EXPORT (str | None): The file timing records get appended to, from
+        $AOC_TIMER_EXPORT.
+    TIMER_MEMORY (bool): Whether timers measure memory by default, from
+        $AOC_TIMER_MEMORY.
+    TIMER_PROFILE (bool): Whether timers profile sections by default, from
+        $AOC_TIMER_PROFILE.
     URL (str): A format url for a given day.
 """
 
 from __future__ import annotations
 
+import array
+import atexit
+import functools
+import gc
+import hashlib
+import heapq
+import importlib.util
+import io
+import json
+import math
+import mmap
+import os
 import re
 import sys
 import time
+import types
+import weakref
+from collections import OrderedDict, deque
+from contextlib import (
+    asynccontextmanager,
+    contextmanager,
+    nullcontext,
+    redirect_stdout,
+)
 from itertools import pairwise
 from pathlib import Path
-from typing import Callable, Iterator
+from typing import IO, TYPE_CHECKING, AsyncIterator, Callable, Iterable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows, downloads are only atomic but not exclusive
+    fcntl = None
+
+if TYPE_CHECKING:
+    import asyncio
+    import pstats
+    import sqlite3
 
-import requests
+    import aiohttp
+    import numpy as np
 
 PROJECT_FOLDER = Path(sys.argv[0]).parent
 COOKIE_PATH = PROJECT_FOLDER / "COOKIE.txt"
 URL = "https://adventofcode.com/2021/day/{}/input"
 CACHE_FILE_NAME_TEMPLATE = "{:02d}.txt"
 CACHE_DIRECTORY = PROJECT_FOLDER / "input"
+CURRENT_DAY: int | None = None
+PERSISTENT_CACHE_MAX_ENTRIES = 1_000_000
+PERSISTENT_CACHE_MAX_BYTES = 256 * 2**20
+PREFETCH_WORKERS = 8
+MAX_CONCURRENT_REQUESTS = 8
+RETRIES = 5
+RETRY_BACKOFF = 0.5
+TIMER_EXPORT = os.environ.get("AOC_TIMER_EXPORT")
+TIMER_BASELINE = os.environ.get("AOC_TIMER_BASELINE")
+REGRESSION_THRESHOLD = float(os.environ.get("AOC_REGRESSION_THRESHOLD", 0.1))
+REGRESSION_MIN_MS = 0.5
+REGRESSION_MIN_BYTES = 64 * 2**10
+TIMER_MEMORY = bool(os.environ.get("AOC_TIMER_MEMORY"))
+TIMER_PROFILE = bool(os.environ.get("AOC_TIMER_PROFILE"))
 
 # ==============================================================================
 # General functions to interface with AOC and fetch files
@@ -90,27 +215,176 @@ def cache_file_for_day(day: int) -> Path:
     return CACHE_DIRECTORY / CACHE_FILE_NAME_TEMPLATE.format(day)
 
 
+@functools.cache
+def session() -> requests.Session:
+    """Get the HTTP session shared by all downloads.
+
+    It keeps connections to the server alive between requests, authenticates
+    with the cookie and retries failed requests with exponential backoff.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    # The HTTP stack takes a while to import and is not needed for cached inputs
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    shared_session = requests.Session()
+    shared_session.cookies.set("session", COOKIE_PATH.read_text().strip())
+    adapter = HTTPAdapter(
+        pool_maxsize=PREFETCH_WORKERS,
+        max_retries=Retry(
+            total=RETRIES,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=(429, 500, 502, 503, 504),
+        ),
+    )
+    shared_session.mount("http://", adapter)
+    shared_session.mount("https://", adapter)
+    return shared_session
+
+
 def ensure_downloaded(day: int) -> None:
     """Ensure the input for a given day is downloaded.
 
+    Several processes may call this at the same time, only one of them will
+    download the input while the others wait for it and then reuse it.
+
+    Args:
+        day (int): The day number.
+    """
+    if cache_file_for_day(day).exists():
+        return
+    with input_lock(day):
+        if not cache_file_for_day(day).exists():
+            response = session().get(URL.format(day))
+            response.raise_for_status()
+            store_input(day, response.content)
+
+
+def _current_umask() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# read once at import, setting it to look is not thread-safe
+_UMASK = _current_umask()
+
+
+def write_atomically(path: Path, content: bytes) -> None:
+    """Write a file through a temporary file which is then renamed, so a reader
+    sees either the old or the complete new file.
+
+    The file gets the permissions open() would give it instead of the private
+    ones of temporary files, and the temporary file is removed on failure.
+
+    Args:
+        path (Path): The file to replace.
+        content (bytes): Its new content.
+    """
+    import tempfile
+
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, suffix=".tmp", delete=False
+    ) as file:
+        try:
+            file.write(content)
+            file.close()
+            os.chmod(file.name, 0o666 & ~_UMASK)
+            os.replace(file.name, path)
+        except BaseException:
+            Path(file.name).unlink(missing_ok=True)
+            raise
+
+
+def store_input(day: int, content: bytes) -> None:
+    """Atomically write the downloaded input for a given day to its cache file.
+
+    Args:
+        day (int): The day number.
+        content (bytes): The input.
+    """
+    CACHE_DIRECTORY.mkdir(exist_ok=True)
+    write_atomically(cache_file_for_day(day), content)
+
+
+def _lock_input(day: int) -> IO:
+    """Block until this process holds the download lock for a day.
+
     Args:
         day (int): The day number.
+
+    Returns:
+        IO: The open lock file, pass it to _unlock_input.
     """
+    CACHE_DIRECTORY.mkdir(exist_ok=True)
     cache_file = cache_file_for_day(day)
-    if not cache_file.exists():
-        cookies = {"session": COOKIE_PATH.read_text().strip()}
-        CACHE_DIRECTORY.mkdir(exist_ok=True)
-        cache_file.write_bytes(requests.get(URL.format(day), cookies=cookies).content)
+    lock_file = cache_file.with_name(f".{cache_file.name}.lock").open("a")
+    if fcntl is not None:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+    return lock_file
+
+
+def _unlock_input(lock_file: IO) -> None:
+    """Release a lock taken with _lock_input."""
+    if fcntl is not None:
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+    lock_file.close()
+
+
+@contextmanager
+def input_lock(day: int) -> Iterator[None]:
+    """Hold the advisory lock for downloading a day across processes.
+
+    Args:
+        day (int): The day number.
+    """
+    lock_file = _lock_input(day)
+    try:
+        yield
+    finally:
+        _unlock_input(lock_file)
+
+
+def prefetch(
+    days: Iterable[int] = range(1, 26), workers: int = PREFETCH_WORKERS
+) -> list[int]:
+    """Download the inputs for several days concurrently.
+
+    Days which are cached already are skipped. All downloads share the pooled
+    connections of `session()`. To test against a local stand-in for the aoc
+    server point `URL` at it first, e.g.
+
+        aoc.URL = "http://localhost:8000/day/{}/input"
+
+    Args:
+        days (Iterable[int], optional): The days to fetch, by default all.
+        workers (int, optional): How many downloads may run at the same time.
+
+    Returns:
+        list[int]: The days that had to be downloaded.
+    """
+    missing = [day for day in days if not cache_file_for_day(day).exists()]
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(ensure_downloaded, missing))
+    return missing
 
 
 def guess_day_from_filename() -> int:
     """Compute the day from the main filename.
 
-    Every digit character is put together and converted to integer.
+    Every digit character is put together and converted to integer. While the
+    runner executes a day, CURRENT_DAY is set and returned instead.
 
     Returns:
         int: The guessed day.
     """
+    if CURRENT_DAY is not None:
+        return CURRENT_DAY
     filename = Path(sys.argv[0]).name
     return int("".join([letter for letter in filename if letter.isdigit()]))
 
@@ -149,6 +423,51 @@ def get_str(day: int | None = None) -> str:
     return cache_file_for_day(day).read_text()
 
 
+def get_mmap(day: int | None = None) -> mmap.mmap | bytes:
+    """Memory-map the input for a specified day.
+
+    Nothing is read from the file until the returned map is accessed, so this
+    is cheap even for inputs that are several gigabytes large. Slice it through
+    a memoryview to avoid copies. Empty files can not be mapped, in which case
+    empty bytes are returned.
+
+    If no day is specified it will try to guess from your file name by grabbing
+    all of the integers.
+
+    Args:
+        day (int | None, optional): The day number.
+
+    Returns:
+        mmap.mmap | bytes: The read-only mapped input for the day.
+    """
+    day = day or guess_day_from_filename()
+    ensure_downloaded(day)
+    with cache_file_for_day(day).open("rb") as file:
+        if not file.seek(0, 2):
+            return b""
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def input_hash(day: int | None = None) -> str:
+    """Get a hash of the input for a specified day.
+
+    The file is hashed in blocks, so this works for inputs larger than memory.
+
+    Args:
+        day (int | None, optional): The day number.
+
+    Returns:
+        str: The hexadecimal sha256 digest of the input.
+    """
+    day = day or guess_day_from_filename()
+    ensure_downloaded(day)
+    digest = hashlib.sha256()
+    with cache_file_for_day(day).open("rb") as file:
+        while block := file.read(1 << 20):
+            digest.update(block)
+    return digest.hexdigest()
+
+
 def get_lines(day: int | None = None) -> list[str]:
     """Get one string per line for a specified day.
 
@@ -165,10 +484,479 @@ def get_lines(day: int | None = None) -> list[str]:
     return get_str(day).strip().split("\n")
 
 
+# ==============================================================================
+# Asynchronous fetching
+
+
+class AsyncFetcher:
+    """Download inputs from within one event loop.
+
+    All requests share one aiohttp connection pool and at most
+    MAX_CONCURRENT_REQUESTS of them are open at once. If a day is requested
+    while it is already being downloaded the running download is awaited
+    instead of starting another one. Use the module functions below instead
+    of this class, they share one fetcher per event loop while downloads
+    overlap and close it once the last one finished. Used directly it is an
+    async context manager that closes its session on exit:
+
+        async with aoc.AsyncFetcher() as fetcher:
+            await fetcher.ensure_downloaded(5)
+
+    Attributes:
+        client (aiohttp.ClientSession): The pooled client session.
+        downloads (dict[int, asyncio.Task]): The downloads in flight by day.
+        limit (asyncio.Semaphore): Caps the number of open requests.
+        users (int): How many module level calls are using the fetcher.
+    """
+
+    client: aiohttp.ClientSession
+    downloads: dict[int, asyncio.Task]
+    limit: asyncio.Semaphore
+    users: int
+
+    def __init__(self):
+        import asyncio
+
+        import aiohttp
+
+        self.client = aiohttp.ClientSession(
+            cookies={"session": COOKIE_PATH.read_text().strip()},
+            connector=aiohttp.TCPConnector(limit=MAX_CONCURRENT_REQUESTS),
+        )
+        self.downloads = {}
+        self.limit = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self.users = 0
+
+    async def __aenter__(self) -> AsyncFetcher:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.client.close()
+
+    async def ensure_downloaded(self, day: int) -> None:
+        """Ensure the input for a given day is downloaded, sharing downloads."""
+        import asyncio
+
+        if cache_file_for_day(day).exists():
+            return
+        if (download := self.downloads.get(day)) is None:
+            download = asyncio.ensure_future(self._download(day))
+            self.downloads[day] = download
+            download.add_done_callback(lambda _: self.downloads.pop(day, None))
+        await asyncio.shield(download)
+
+    async def _download(self, day: int) -> None:
+        """Download and store a day holding its lock."""
+        import asyncio
+
+        lock_file = await asyncio.to_thread(_lock_input, day)
+        try:
+            if not cache_file_for_day(day).exists():
+                await self._download_unlocked(day)
+        finally:
+            _unlock_input(lock_file)
+
+    async def _download_unlocked(self, day: int) -> None:
+        """Download and store a day, retrying with exponential backoff."""
+        import asyncio
+
+        import aiohttp
+
+        for attempt in range(RETRIES + 1):
+            try:
+                async with self.limit, self.client.get(URL.format(day)) as response:
+                    if response.status not in (429, 500, 502, 503, 504):
+                        response.raise_for_status()
+                        store_input(day, await response.read())
+                        return
+                    error = aiohttp.ClientResponseError(
+                        response.request_info, (), status=response.status
+                    )
+            except aiohttp.ClientConnectionError as connection_error:
+                error = connection_error
+            if attempt < RETRIES:
+                await asyncio.sleep(RETRY_BACKOFF * 2**attempt)
+        raise error
+
+
+_async_fetchers: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncFetcher] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+@asynccontextmanager
+async def _async_fetcher() -> AsyncIterator[AsyncFetcher]:
+    """Use the fetcher of the running event loop, creating it if needed. Its
+    session is closed as soon as no call is using the fetcher any more.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    if (fetcher := _async_fetchers.get(loop)) is None:
+        fetcher = _async_fetchers[loop] = AsyncFetcher()
+    fetcher.users += 1
+    try:
+        yield fetcher
+    finally:
+        fetcher.users -= 1
+        if not fetcher.users:
+            if _async_fetchers.get(loop) is fetcher:
+                del _async_fetchers[loop]
+            await fetcher.client.close()
+
+
+async def aensure_downloaded(day: int) -> None:
+    """Asynchronous version of ensure_downloaded.
+
+    The cookie is only read and a session only opened if the input is not
+    cached yet.
+
+    Args:
+        day (int): The day number.
+    """
+    if cache_file_for_day(day).exists():
+        return
+    async with _async_fetcher() as fetcher:
+        await fetcher.ensure_downloaded(day)
+
+
+async def aget(day: int | None = None) -> bytes:
+    """Asynchronous version of get.
+
+    Args:
+        day (int | None, optional): The day number.
+
+    Returns:
+        bytes: The input for the day.
+    """
+    day = day or guess_day_from_filename()
+    await aensure_downloaded(day)
+    return cache_file_for_day(day).read_bytes()
+
+
+async def aget_str(day: int | None = None) -> str:
+    """Asynchronous version of get_str.
+
+    Args:
+        day (int | None, optional): The day number.
+
+    Returns:
+        str: The input for the day.
+    """
+    day = day or guess_day_from_filename()
+    await aensure_downloaded(day)
+    return cache_file_for_day(day).read_text()
+
+
+async def aget_many(days: Iterable[int] = range(1, 26)) -> list[bytes]:
+    """Get the inputs of several days, downloading them concurrently.
+
+    Args:
+        days (Iterable[int], optional): The days to get, by default all.
+
+    Returns:
+        list[bytes]: The inputs in the order of the days.
+    """
+    import asyncio
+
+    return await asyncio.gather(*(aget(day) for day in days))
+
+
+async def aclose() -> None:
+    """Close the connection pool of the running event loop, if there is one."""
+    import asyncio
+
+    if (fetcher := _async_fetchers.pop(asyncio.get_running_loop(), None)) is not None:
+        await fetcher.client.close()
+
+
 # ==============================================================================
 # Getting complex queries
 
 
+def sidecar_directory() -> Path:
+    """The directory cached parses and other derived data are kept in."""
+    return CACHE_DIRECTORY / ".cache"
+
+
+def _code_identity(code: types.CodeType) -> str:
+    """A hash of what a code object does, stable between runs. Nested code
+    objects like those of inner lambdas are hashed instead of their repr, which
+    contains their address.
+    """
+    digest = hashlib.sha256(code.co_code)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            digest.update(_code_identity(const).encode())
+        else:
+            digest.update(repr(const).encode())
+    digest.update(repr(code.co_names).encode())
+    return digest.hexdigest()[:16]
+
+
+def _global_names(code: types.CodeType) -> set[str]:
+    """The names a code object and the code nested in it may look up."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _global_names(const)
+    return names
+
+
+def _describe_function(function: types.FunctionType, seen: frozenset[int]) -> str:
+    """Describe a function by its name, code and everything it reads besides
+    its arguments: the contents of its closure, its defaults and the globals it
+    refers to. Two closures made by one factory only differ in the first.
+    """
+    name = f"{function.__module__}.{function.__qualname__}"
+    if id(function) in seen:
+        return name
+    seen |= {id(function)}
+    parts = [_code_identity(function.__code__)]
+    for cell in function.__closure__ or ():
+        try:
+            parts.append(_describe(cell.cell_contents, seen))
+        except ValueError:  # a cell that is not assigned yet
+            parts.append("<empty>")
+    parts.append(_describe(function.__defaults__ or (), seen))
+    parts.append(_describe(sorted((function.__kwdefaults__ or {}).items()), seen))
+    for global_name in sorted(_global_names(function.__code__)):
+        if global_name in function.__globals__:
+            value = function.__globals__[global_name]
+            parts.append(f"{global_name}={_describe(value, seen)}")
+    digest = hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
+    return f"{name}:{digest}"
+
+
+def _describe(value: any, seen: frozenset[int] = frozenset()) -> str:
+    """A stable textual description of a section argument.
+
+    Functions are described by what they compute, see _describe_function.
+    Builtins, classes and modules are described by name, simple values by their
+    repr and other values by a hash of their pickle.
+
+    Raises:
+        TypeError: If the value can not be described reliably, which makes the
+            section uncacheable.
+    """
+    if isinstance(value, (str, bytes, int, float, complex, type(None))):
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        return "(" + ", ".join(_describe(item, seen) for item in value) + ")"
+    if isinstance(value, dict):
+        return _describe(list(value.items()), seen)
+    if isinstance(value, types.ModuleType):
+        return f"<module {value.__name__}>"
+    if isinstance(value, types.FunctionType):
+        return _describe_function(value, seen)
+    if isinstance(value, types.MethodType):
+        return f"method{_describe((value.__func__, value.__self__), seen)}"
+    if isinstance(value, functools.partial):
+        arguments = (value.func, value.args, value.keywords)
+        return f"partial{_describe(arguments, seen)}"
+    if callable(value) and hasattr(value, "__qualname__"):
+        return f"{value.__module__}.{value.__qualname__}"
+    import pickle
+
+    try:
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, AttributeError) as error:
+        raise TypeError(f"{value!r} can not be pickled") from error
+    return f"<{type(value).__qualname__} {hashlib.sha256(pickled).hexdigest()[:16]}>"
+
+
+def _section(cacheable: bool = True) -> Callable:
+    """Decorate a Parse method that parses a section.
+
+    The call and its arguments get recorded in the signature of the Parse. If
+    caching is enabled the parsed section is loaded from or stored to its
+    sidecar file. Sections called from within other sections are not recorded.
+
+    Args:
+        cacheable (bool, optional): Whether the section can be pickled. Once a
+            section that can not be or whose arguments can not be described is
+            parsed, caching stops for the chain.
+    """
+
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self: Parse, *args, **kwargs) -> Parse:
+            if self._in_section:
+                return method(self, *args, **kwargs)
+            try:
+                described = [_describe(arg) for arg in args] + [
+                    f"{key}={_describe(arg)}" for key, arg in kwargs.items()
+                ]
+            except TypeError:
+                described, self.cache = ["?"], False
+            self.signature.append(f"{method.__name__}({', '.join(described)})")
+            self.cache = self.cache and cacheable
+            if self.cache and self._load_section():
+                return self
+            self._in_section = True
+            try:
+                method(self, *args, **kwargs)
+            finally:
+                self._in_section = False
+            if self.cache:
+                self._store_section()
+            return self
+
+        return wrapper
+
+    return decorator
+
+
+WHITESPACE = b" \t\n\r\x0b\x0c"
+BLANK_LINE = re.compile(rb"\n\r?\n")
+
+
+class Lines:
+    """A cursor over a list of lines.
+
+    Parse consumes its input through this instead of popping lines off the
+    front of a list, so every line is touched once and parsing stays linear in
+    the length of the input.
+
+    Attributes:
+        lines (list[str]): All lines of the input.
+        position (int): The index of the next line.
+    """
+
+    lines: list[str]
+    position: int
+
+    def __init__(self, lines: list[str]):
+        self.lines = lines
+        self.position = 0
+
+    def __bool__(self) -> bool:
+        return self.position < len(self.lines)
+
+    def peek(self) -> str:
+        """Get the next line without consuming it."""
+        return self.lines[self.position]
+
+    def next_line(self) -> str:
+        """Consume the next line."""
+        line = self.lines[self.position]
+        self.position += 1
+        return line
+
+    def remaining(self) -> list[str]:
+        """Consume all remaining lines."""
+        lines = self.lines[self.position :]
+        self.position = len(self.lines)
+        return lines
+
+    def raw_section(self) -> bytes:
+        """Consume lines until one is empty and return them as encoded bytes."""
+        section = []
+        while self and (line := self.next_line()):
+            section.append(line)
+        self.skip_blank_lines()
+        return "\n".join(section).encode()
+
+    def skip_blank_lines(self) -> None:
+        """Consume empty lines, a run of them separates two sections."""
+        while self and not self.peek():
+            self.position += 1
+
+
+class MappedLines:
+    """Lazily split a memory-mapped input into lines.
+
+    It offers the same interface as Lines. Line boundaries are only searched
+    for when a line is requested and only that line gets decoded. Like
+    `get_lines` leading and trailing whitespace of the whole input is ignored
+    and lines do not keep the carriage return of Windows line endings.
+
+    Attributes:
+        data (mmap.mmap | bytes): The mapped input.
+        view (memoryview): A zero-copy view onto the data.
+        position (int): The byte offset of the next line.
+        end (int): The byte offset the input ends at.
+    """
+
+    data: mmap.mmap | bytes
+    view: memoryview
+    position: int
+    end: int
+
+    def __init__(self, data: mmap.mmap | bytes):
+        self.data = data
+        self.view = memoryview(data)
+        self.position, self.end = 0, len(data)
+        while self.position < self.end and data[self.position] in WHITESPACE:
+            self.position += 1
+        while self.end > self.position and data[self.end - 1] in WHITESPACE:
+            self.end -= 1
+
+    def __bool__(self) -> bool:
+        return self.position < self.end
+
+    def _line_end(self) -> int:
+        """The byte offset of the end of the next line."""
+        line_end = self.data.find(b"\n", self.position, self.end)
+        return self.end if line_end == -1 else line_end
+
+    def _line(self, line_end: int) -> memoryview:
+        """The next line up to the given offset without its carriage return."""
+        if line_end > self.position and self.data[line_end - 1] == ord("\r"):
+            return self.view[self.position : line_end - 1]
+        return self.view[self.position : line_end]
+
+    def raw_line(self) -> memoryview:
+        """Consume the next line without decoding or copying it."""
+        if not self:
+            raise IndexError("No lines remaining")
+        line_end = self._line_end()
+        line = self._line(line_end)
+        self.position = line_end + 1
+        return line
+
+    def peek(self) -> str:
+        """Get the next line without consuming it."""
+        if not self:
+            raise IndexError("No lines remaining")
+        return str(self._line(self._line_end()), "utf-8")
+
+    def next_line(self) -> str:
+        """Consume the next line."""
+        return str(self.raw_line(), "utf-8")
+
+    def raw_section(self) -> memoryview | bytes:
+        """Consume lines until one is empty without decoding them.
+
+        The section is only copied if it has to be rid of carriage returns.
+        """
+        start = self.position
+        if self and not self._line(self._line_end()):
+            self.skip_blank_lines()
+            return self.view[start:start]
+        blank_line = BLANK_LINE.search(self.data, start, self.end)
+        section_end = self.end if blank_line is None else blank_line.start()
+        self.position = section_end + 1
+        self.skip_blank_lines()
+        section = self.view[start:section_end]
+        if self.data.find(b"\r", start, section_end) == -1:
+            return section
+        return bytes(section).replace(b"\r\n", b"\n").removesuffix(b"\r")
+
+    def skip_blank_lines(self) -> None:
+        """Consume empty lines, a run of them separates two sections."""
+        while self and not self._line(self._line_end()):
+            self.position = self._line_end() + 1
+
+    def remaining(self) -> list[str]:
+        """Consume and decode all remaining lines."""
+        if not self:
+            return []
+        text = str(self.view[self.position : self.end], "utf-8")
+        self.position = self.end + 1
+        return text.replace("\r\n", "\n").split("\n")
+
+
 class Parse:
     """Do complex parses of multiple different blocks if necessary.
 
@@ -191,22 +979,111 @@ class Parse:
 
         foo = aoc.Parse().comma_integers().get()
 
-    Parse can be supplied with an optional day in the constructor.
+    Parse can be supplied with an optional day in the constructor. With
+    `mmap=True` the input is memory-mapped and lines are only located and
+    decoded as they are consumed, see MappedLines.
+
+    Sections starting with `iter_` do not build a list but put a generator into
+    their slot that consumes the input while it is iterated. Such a section has
+    to be the last one as it owns the rest of the input.
+
+        for record in aoc.Parse().iter_regex(r"(.+) (\d+)", (str, int)).get():
+            ...
+
+    With `cache=True` every section is stored in a sidecar file keyed by the
+    recorded chain of section calls up to it. It is reused as long as the hash
+    of the input matches the one stored with it. The input is only read and
+    split once a section is not found in the cache. Example inputs given with
+    `alt` are never cached.
 
     Attributes:
-        buffer (str): The buffer of the remaining input.
+        cache (bool): Whether sections are loaded from and stored to disk.
         day (int): The observed day.
+        mmap (bool): Whether the input is memory-mapped.
         sections (list): The sections that have already been parsed.
+        signature (list[str]): The recorded section calls, e.g.
+            ["comma_integers()", "regex_lines('(.+)', (builtins.str))"].
     """
 
     day: int
     sections: list[any]
-    buffer: str
-
-    def __init__(self, day: int | None = None, alt: str | None = None):
+    signature: list[str]
+    cache: bool
+    mmap: bool
+
+    def __init__(
+        self,
+        day: int | None = None,
+        alt: str | None = None,
+        mmap: bool = False,
+        cache: bool = False,
+    ):
         self.day = day or guess_day_from_filename()
         self.sections = []
-        self.buffer = get_lines(self.day) if alt is None else alt.split("\n")
+        self.signature = []
+        self.mmap = mmap
+        self.cache = cache and alt is None
+        self._in_section = False
+        self._input_hash = None
+        self._buffer = None if alt is None else Lines(alt.split("\n"))
+        self._position = None
+
+    @property
+    def buffer(self) -> Lines | MappedLines:
+        """The cursor over the remaining input. The input is read on first use."""
+        if self._buffer is None:
+            if self.mmap:
+                self._buffer = MappedLines(get_mmap(self.day))
+            else:
+                self._buffer = Lines(get_lines(self.day))
+            # only move past sections loaded from the cache, the cursor of a
+            # fresh buffer already skipped the leading whitespace of the input
+            if self._position is not None:
+                self._buffer.position = self._position
+        return self._buffer
+
+    def _sidecar(self) -> Path:
+        """The sidecar file for the section chain recorded so far."""
+        chain = "\n".join(["mmap" if self.mmap else "lines", *self.signature])
+        key = hashlib.sha256(chain.encode()).hexdigest()[:16]
+        return sidecar_directory() / f"{self.day:02d}-parse-{key}.pickle"
+
+    def _load_section(self) -> bool:
+        """Load the last recorded section from its sidecar if it is fresh.
+
+        Returns:
+            bool: Whether the section could be loaded.
+        """
+        import pickle
+
+        self._input_hash = self._input_hash or input_hash(self.day)
+        try:
+            with self._sidecar().open("rb") as file:
+                stored_hash, section, position = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return False
+        if stored_hash != self._input_hash:
+            return False
+        self.sections.append(section)
+        if self._buffer is None:
+            self._position = position
+        else:
+            self._buffer.position = position
+        return True
+
+    def _store_section(self) -> None:
+        """Store the last parsed section in its sidecar."""
+        import pickle
+
+        sidecar = self._sidecar()
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        write_atomically(
+            sidecar,
+            pickle.dumps(
+                (self._input_hash, self.sections[-1], self.buffer.position),
+                pickle.HIGHEST_PROTOCOL,
+            ),
+        )
 
     def __iter__(self) -> Iterator[any]:
         return iter(self.sections)
@@ -220,24 +1097,37 @@ class Parse:
         return self.sections[0]
 
     def _remove_trailing_next(self) -> None:
-        """Remove the next line if it is empty."""
-        if self.buffer and (self.buffer[0] == ""):
-            self.buffer.pop(0)
+        """Remove the empty lines that follow."""
+        self.buffer.skip_blank_lines()
+
+    def _section_lines(self) -> Iterator[str]:
+        """Consume lines until one is empty, which is consumed as well as any
+        empty lines right after it.
+        """
+        while self.buffer and (line := self.buffer.next_line()):
+            yield line
+        self.buffer.skip_blank_lines()
 
+    @_section()
     def line(self) -> Parse:
         """Gets a single line."""
-        self.sections.append(self.buffer.pop(0))
+        self.sections.append(self.buffer.next_line())
         self._remove_trailing_next()
         return self
 
+    @_section()
     def lines(self) -> Parse:
         """Gets a list of lines until one is empty."""
-        current_section: list[str] = []
-        while self.buffer and (line := self.buffer.pop(0)):
-            current_section.append(line)
-        self.sections.append(current_section)
+        self.sections.append(list(self._section_lines()))
+        return self
+
+    @_section(cacheable=False)
+    def iter_lines(self) -> Parse:
+        """Like lines but yields them one at a time while they are consumed."""
+        self.sections.append(self._section_lines())
         return self
 
+    @_section()
     def regex_lines(self, query: str, data_types: list[Callable]) -> Parse:
         """Match a list of lines until one is empty to regex and convert them
         to given data types.
@@ -259,39 +1149,95 @@ class Parse:
             query (str): The regex query.
             data_types (list[Callable]): The datatype conversion.
         """
-        self.lines()
+        self.sections.append(list(self._regex_records(query, data_types)))
+        return self
+
+    @_section(cacheable=False)
+    def iter_regex(self, query: str, data_types: list[Callable]) -> Parse:
+        """Like regex_lines but yields the records one at a time while the
+        lines are consumed.
+        """
+        self.sections.append(self._regex_records(query, data_types))
+        return self
+
+    def _regex_records(
+        self, query: str, data_types: list[Callable]
+    ) -> Iterator[list[any]]:
+        """Match lines until one is empty and convert the groups."""
         pattern = re.compile(query)
-        self.sections[-1] = [
-            [
+        for line in self._section_lines():
+            yield [
                 dtype(match)
                 for match, dtype in zip(pattern.match(line).groups(), data_types)
             ]
-            for line in self.sections[-1]
-        ]
+
+    @_section()
+    def regex_columns(self, query: str, data_types: list[Callable]) -> Parse:
+        """Like regex_lines but columnar: one array per capture group.
+
+        The whole section is matched in one go and every column is converted
+        at once, so there is no Python work per line. For example
+
+            x, y = aoc.Parse().regex_columns(r"(\d+),(\d+)", (int, int)).get()
+
+        yields two numpy int64 arrays. `int`, `float` and numpy dtypes are cast
+        by numpy, integers too large for int64 are kept as Python ints in an
+        object array. `str` yields a numpy string array and other callables
+        are applied per element as a fallback. The query is anchored at the
+        start of every line, do not let it match across line breaks (e.g. with
+        `\s`).
+
+        Args:
+            query (str): The regex query.
+            data_types (list[Callable]): The datatype conversion per group.
+
+        Raises:
+            ValueError: If not every line of the section matches.
+        """
+        import numpy as np
+
+        text = str(self.buffer.raw_section(), "utf-8")
+        pattern = re.compile(f"^(?:{query})", re.MULTILINE)
+        records = pattern.findall(text)
+        if len(records) != (text.count("\n") + 1 if text else 0):
+            raise ValueError(f"Not every line matches {query!r}")
+        columns = max(pattern.groups, 1)
+        table = np.array(records, dtype=str).reshape(len(records), columns)
+        self.sections.append(
+            tuple(
+                _convert_column(column, dtype)
+                for column, dtype in zip(table.T, data_types)
+            )
+        )
         return self
 
+    @_section()
     def regex_lines_single(self, query: str, data_type: Callable) -> Parse:
         """Like regex_lines but does not return a tuple but a single element."""
         self.regex_lines(query, [data_type])
         self.sections[-1] = [line[0] for line in self.sections[-1]]
         return self
 
+    @_section()
     def integers(self) -> Parse:
         """Reads the lines as integers until there is an empty line."""
         self.lines()
         self.sections[-1] = [int(line) for line in self.sections[-1]]
         return self
 
+    @_section()
     def comma_integers(self, separator=",") -> Parse:
         """Reads a single line as comma separated integers.
 
         Args:
             separator (str, optional): The separator, by default ",".
         """
-        self.sections.append([int(x) for x in self.buffer.pop(0).split(separator)])
+        line = self.buffer.next_line()
+        self.sections.append([int(x) for x in line.split(separator)])
         self._remove_trailing_next()
         return self
 
+    @_section()
     def dense_int_matrix(self) -> Parse:
         """Read a dense integer matrix with one integer per character into a 2d
         array. For example
@@ -306,19 +1252,81 @@ class Parse:
         self.sections[-1] = [[int(char) for char in line] for line in self.sections[-1]]
         return self
 
+    @_section()
+    def dense_int_array(self) -> Parse:
+        """Like dense_int_matrix but read into a 2d numpy uint8 array.
+
+        The bytes of the section are reinterpreted as an array without any work
+        per character, which makes this fit for very large grids.
+        """
+        self.sections.append(_byte_grid(self.buffer.raw_section()) - ord("0"))
+        return self
+
+    @_section()
+    def char_grid(self) -> Parse:
+        """Read a map of characters like `#.#..` into a 2d numpy uint8 array
+        holding the character codes. Compare with `ord`, for example
+
+            walls = aoc.Parse().char_grid().get() == ord("#")
+        """
+        self.sections.append(_byte_grid(self.buffer.raw_section()).copy())
+        return self
+
+    @_section()
     def remaining_lines(self) -> Parse:
         """Put the remaining lines into the next variable for manual parsing."""
-        self.sections.append(self.buffer)
-        self.buffer = ""
+        self.sections.append(self.buffer.remaining())
         return self
 
 
+def _convert_column(column: np.ndarray, dtype: Callable) -> np.ndarray:
+    """Convert a numpy array of matched strings to the requested type."""
+    import numpy as np
+
+    if dtype is str:
+        return column
+    try:
+        return column.astype(np.dtype(dtype))
+    except (TypeError, ValueError, OverflowError):
+        # numpy makes an object array of ints that do not fit into int64
+        return np.array([dtype(value) for value in column.tolist()])
+
+
+def _byte_grid(raw: bytes | memoryview) -> np.ndarray:
+    """View equally long lines of bytes as a 2d uint8 array without copying.
+
+    Args:
+        raw (bytes | memoryview): The lines separated by newlines.
+
+    Raises:
+        ValueError: If the lines are not of equal length.
+
+    Returns:
+        np.ndarray: A read-only array with one row per line.
+    """
+    import numpy as np
+
+    data = np.frombuffer(raw, dtype=np.uint8)
+    if not len(data):
+        return np.zeros((0, 0), dtype=np.uint8)
+    newlines = np.flatnonzero(data == ord("\n"))
+    width = int(newlines[0]) if len(newlines) else len(data)
+    rows, unaligned = divmod(len(data) + 1, width + 1)
+    if unaligned or len(newlines) != rows - 1:
+        raise ValueError("Grid lines are not of equal length")
+    return np.lib.stride_tricks.as_strided(
+        data, shape=(rows, width), strides=(width + 1, 1), writeable=False
+    )
+
+
 # ==============================================================================
 # Simple aliases
 
 get_integers = lambda *args: Parse(*args).integers().get()
 get_comma_integers = lambda *args: Parse(*args).comma_integers().get()
 get_dense_int_matrix = lambda *args: Parse(*args).dense_int_matrix().get()
+get_dense_int_array = lambda *args: Parse(*args).dense_int_array().get()
+get_char_grid = lambda *args: Parse(*args).char_grid().get()
 
 
 # ==============================================================================
@@ -333,26 +1341,1420 @@ def is_test() -> bool:
 
 
 # ==============================================================================
-# Timing code runtime
+# Grids
 
 
-class Timer:
-    """Used to time days.
+class Grid:
+    """A 2d numpy array with the neighbourhood operations of the map puzzles.
 
-    Usage like:
+    Instead of looping over the neighbours of every cell with bounds checks,
+    whole arrays of neighbours are looked at at once. The cells outside of the
+    grid are given by a numpy padding mode: "constant" uses `fill`, "edge"
+    repeats the border and "wrap" continues on the opposite side.
 
-        with aoc.Timer() as timer:
-            part1()
-            timer.mark()
-            part2()
+        grid = aoc.Grid(aoc.get_dense_int_array())
+        low_points = (grid.cells < grid.neighbours(fill=10)).all(axis=0)
+        flashes = grid.stencil(np.ones((3, 3)))
 
-    It will automatically print a timed table. The initializer can get a custom
-    day name if you feel like it. If you don't call mark it will be timed as one
-    piece. I prefer to use it as
+    Attributes:
+        cells (np.ndarray): The values, indexed by [y, x].
+        OFFSETS (dict[int, list[tuple[int, int]]]): The (dy, dx) of the 4 and
+            the 8 neighbours of a cell in reading order.
+    """
 
-        import aoc
+    OFFSETS = {
+        4: [(-1, 0), (0, -1), (0, 1), (1, 0)],
+        8: [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)],
+    }
+
+    cells: np.ndarray
+
+    def __init__(self, cells: np.ndarray):
+        import numpy as np
+
+        self.cells = np.asarray(cells)
+        self._tables = {}
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.cells.shape
+
+    def padded(
+        self, width: int = 1, mode: str = "constant", fill: any = 0
+    ) -> np.ndarray:
+        """A copy of the cells with `width` cells of padding on every side."""
+        import numpy as np
+
+        if mode == "constant":
+            return np.pad(self.cells, width, mode, constant_values=fill)
+        return np.pad(self.cells, width, mode)
+
+    def shifted(
+        self, dy: int, dx: int, mode: str = "constant", fill: any = 0
+    ) -> np.ndarray:
+        """The neighbour at (y + dy, x + dx) of every cell, a view of a padding."""
+        width = max(abs(dy), abs(dx))
+        height, length = self.shape
+        return self.padded(width, mode, fill)[
+            width + dy : width + dy + height, width + dx : width + dx + length
+        ]
 
-        def main(timer: aoc.Timer) -> None:
+    def neighbours(
+        self, count: int = 4, mode: str = "constant", fill: any = 0
+    ) -> np.ndarray:
+        """The values of the 4 or 8 neighbours of every cell.
+
+        Returns:
+            np.ndarray: The neighbours in the order of OFFSETS along the first
+                axis, the cells along the other two.
+        """
+        import numpy as np
+
+        padding = self.padded(1, mode, fill)
+        height, width = self.shape
+        return np.stack(
+            [
+                padding[1 + dy : 1 + dy + height, 1 + dx : 1 + dx + width]
+                for dy, dx in self.OFFSETS[count]
+            ]
+        )
+
+    def windows(
+        self, size: int = 3, mode: str = "constant", fill: any = 0
+    ) -> np.ndarray:
+        """The size × size window around every cell, without copying them.
+
+        Returns:
+            np.ndarray: A read-only array indexed by [y, x, window y, window x].
+        """
+        import numpy as np
+
+        padding = self.padded(size // 2, mode, fill)
+        return np.lib.stride_tricks.sliding_window_view(padding, (size, size))
+
+    def stencil(
+        self, kernel: np.ndarray, mode: str = "constant", fill: any = 0
+    ) -> np.ndarray:
+        """Weigh the neighbourhood of every cell with a square kernel and sum up.
+
+        Args:
+            kernel (np.ndarray): The odd sized weights, centered on the cell.
+
+        Returns:
+            np.ndarray: The weighted sums, shaped like the cells.
+        """
+        import numpy as np
+
+        radius = len(kernel) // 2
+        padding = self.padded(radius, mode, fill)
+        height, width = self.shape
+        result = np.zeros(self.shape, dtype=np.result_type(self.cells, kernel))
+        for (y, x), weight in np.ndenumerate(kernel):
+            if weight:
+                result += weight * padding[y : y + height, x : x + width]
+        return result
+
+    def neighbour_table(self, count: int = 4) -> np.ndarray:
+        """The flat indices of the 4 or 8 neighbours of every flat cell index.
+
+        Graph searches over the grid can walk this instead of checking bounds.
+        Neighbours outside of the grid are -1. The table is computed once.
+
+        Returns:
+            np.ndarray: An array shaped (height * width, count).
+        """
+        import numpy as np
+
+        if count not in self._tables:
+            indices = Grid(np.arange(self.cells.size).reshape(self.shape))
+            table = indices.neighbours(count, fill=-1).reshape(count, -1).T
+            self._tables[count] = np.ascontiguousarray(table)
+        return self._tables[count]
+
+    def label(self, mask: np.ndarray, count: int = 4) -> np.ndarray:
+        """Number the connected regions of the cells selected by a mask.
+
+        Every cell starts with its own number and takes the smallest number
+        among its neighbours until nothing changes, with pointer jumping so
+        long regions do not need as many rounds as they are long.
+
+        Args:
+            mask (np.ndarray): The cells that belong to some region.
+            count (int, optional): Whether 4 or 8 neighbours are connected.
+
+        Returns:
+            np.ndarray: The flat index of the first cell of the region of
+                every cell, -1 outside of the mask.
+        """
+        import numpy as np
+
+        mask = np.asarray(mask, dtype=bool).ravel()
+        table = self.neighbour_table(count)
+        # edges between neighbouring cells both inside the mask
+        cells = np.repeat(np.arange(mask.size), count)
+        targets = table.ravel()
+        inside = (targets >= 0) & mask[cells] & mask[np.maximum(targets, 0)]
+        cells, targets = cells[inside], targets[inside]
+        labels = np.where(mask, np.arange(mask.size), -1)
+        while True:
+            previous = labels.copy()
+            np.minimum.at(labels, cells, labels[targets])
+            labels = np.where(mask, labels[np.maximum(labels, 0)], -1)
+            if np.array_equal(labels, previous):
+                return labels.reshape(self.shape)
+
+
+# ==============================================================================
+# Graph search
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """Keep the garbage collector from running while millions of small lists
+    are built. They hold no cycles, but every collection would walk them all.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class SearchStats:
+    """Counters of the work a search did, they add up over several searches.
+
+    Attributes:
+        expanded (int): How many nodes had their edges looked at.
+        pushes (int): How many entries were put into the queue.
+        pops (int): How many entries were taken out of it, including stale ones.
+    """
+
+    expanded: int
+    pushes: int
+    pops: int
+
+    def __init__(self, expanded: int = 0, pushes: int = 0, pops: int = 0):
+        self.expanded = expanded
+        self.pushes = pushes
+        self.pops = pops
+
+    def __repr__(self) -> str:
+        return (
+            f"SearchStats(expanded={self.expanded}, pushes={self.pushes}, "
+            f"pops={self.pops})"
+        )
+
+    def add(self, expanded: int, pushes: int, pops: int) -> None:
+        self.expanded += expanded
+        self.pushes += pushes
+        self.pops += pops
+
+
+class Graph:
+    """A directed graph on the integer nodes 0, 1, … in compressed sparse row
+    form. The edges leaving node n are the entries offsets[n] to
+    offsets[n + 1] of the flat targets and weights arrays.
+
+    The searches below keep their distances in flat lists indexed by node,
+    which is a lot faster than dicts of coordinate tuples. The edges are kept
+    in typed arrays of 4 or 8 bytes per entry instead of lists of int objects.
+
+    Attributes:
+        offsets (array.array): Where the edges of every node start, followed
+            by the number of edges.
+        targets (array.array): The node every edge leads to.
+        weights (array.array): The weight of every edge.
+    """
+
+    offsets: array.array
+    targets: array.array
+    weights: array.array
+
+    def __init__(
+        self,
+        offsets: array.array | None = None,
+        targets: array.array | None = None,
+        weights: array.array | None = None,
+    ):
+        self.offsets = array.array("q", [0]) if offsets is None else offsets
+        self.targets = array.array("q") if targets is None else targets
+        self.weights = array.array("q") if weights is None else weights
+
+    @property
+    def size(self) -> int:
+        return len(self.offsets) - 1
+
+    def edges(self, node: int) -> Iterable[tuple[int, int]]:
+        """The (target, weight) pairs of the edges leaving a node."""
+        start, end = self.offsets[node], self.offsets[node + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+    @classmethod
+    def from_edges(
+        cls,
+        size: int,
+        sources: np.ndarray,
+        targets: np.ndarray,
+        weights: np.ndarray | int = 1,
+    ) -> Graph:
+        """Build a graph from parallel arrays of edges in any order.
+
+        Args:
+            size (int): The number of nodes.
+            sources (np.ndarray): The node every edge leaves.
+            targets (np.ndarray): The node every edge leads to.
+            weights (np.ndarray | int, optional): The weight of every edge or
+                of all of them, by default 1.
+        """
+        import numpy as np
+
+        sources = np.asarray(sources)
+        order = np.argsort(sources, kind="stable")
+        weights = np.broadcast_to(weights, sources.shape)
+        offsets = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=size), out=offsets[1:])
+        return cls(
+            _typed_array(offsets),
+            _typed_array(np.asarray(targets)[order], size),
+            _typed_array(weights[order]),
+        )
+
+    @classmethod
+    def from_grid(cls, costs: np.ndarray, count: int = 4) -> Graph:
+        """Connect every cell of a grid to its neighbours at the cost of entering
+        them. The node of the cell [y, x] is y * width + x.
+
+        The edges are computed for blocks of rows at a time, so besides the
+        graph itself only little memory is needed.
+        """
+        import numpy as np
+
+        costs = np.asarray(costs)
+        height, width = costs.shape
+        flat_costs = costs.ravel()
+        dy, dx = np.array(Grid.OFFSETS[count]).T
+        if costs.dtype.kind == "f":
+            weight_typecode = "d"
+        else:
+            weight_typecode = _int_typecode(
+                int(flat_costs.min(initial=0)), int(flat_costs.max(initial=0))
+            )
+        graph = cls(
+            array.array("q", [0]),
+            array.array(_int_typecode(costs.size)),
+            array.array(weight_typecode),
+        )
+        rows = max(1, 2**16 // max(width, 1))
+        for top in range(0, height, rows):
+            y, x = np.divmod(
+                np.arange(top * width, min(top + rows, height) * width), width
+            )
+            y, x = y[:, None] + dy, x[:, None] + dx
+            inside = (0 <= y) & (y < height) & (0 <= x) & (x < width)
+            targets = (y * width + x)[inside]
+            ends = graph.offsets[-1] + np.cumsum(inside.sum(axis=1))
+            graph.offsets.frombytes(ends.astype(np.int64).tobytes())
+            graph.targets.frombytes(targets.astype(graph.targets.typecode).tobytes())
+            weights = flat_costs[targets].astype(graph.weights.typecode)
+            graph.weights.frombytes(weights.tobytes())
+        return graph
+
+
+def _int_typecode(*values: int) -> str:
+    """The array.array typecode of 4 or 8 byte ints that holds all values."""
+    return "i" if all(-(2**31) <= value < 2**31 for value in values) else "q"
+
+
+def _typed_array(values: np.ndarray, *bounds: int) -> array.array:
+    """Copy numbers into an array.array of 4 or 8 byte ints, or of doubles.
+
+    Args:
+        values (np.ndarray): The numbers.
+        *bounds (int): Further values the ints have to hold, like the number
+            of nodes for node arrays that may be empty.
+    """
+    if values.dtype.kind == "f":
+        typecode = "d"
+    else:
+        extremes = [int(values.min()), int(values.max())] if values.size else []
+        typecode = _int_typecode(*extremes, *bounds)
+    return array.array(typecode, values.astype(typecode).tobytes())
+
+
+class StateGraph(Graph):
+    """A graph that is too large to build, given by a function from a state to
+    the (state, weight) pairs it leads to. States have to be hashable and get
+    an integer node the first time they are seen.
+
+        graph = aoc.StateGraph(moves)
+        aoc.dijkstra(graph, graph.node(start), is_solved)
+
+    Attributes:
+        successors (Callable): Gives the (state, weight) pairs after a state.
+        states (list): The state of every node.
+        nodes (dict): The node of every state seen so far.
+    """
+
+    successors: Callable[[any], Iterable[tuple[any, int]]]
+    states: list
+    nodes: dict
+
+    def __init__(self, successors: Callable[[any], Iterable[tuple[any, int]]]):
+        self.successors = successors
+        self.states = []
+        self.nodes = {}
+
+    @property
+    def size(self) -> int:
+        return len(self.states)
+
+    def node(self, state: any) -> int:
+        """The integer node of a state, numbering it if it is new."""
+        node = self.nodes.get(state)
+        if node is None:
+            node = self.nodes[state] = len(self.states)
+            self.states.append(state)
+        return node
+
+    def edges(self, node: int) -> Iterable[tuple[int, int]]:
+        return zip(*self.expand(node))
+
+    def expand(self, node: int) -> tuple[list[int], list[int]]:
+        """The targets and the weights of the edges leaving a node as lists,
+        like the slices of them in a Graph.
+        """
+        targets, weights = [], []
+        for state, weight in self.successors(self.states[node]):
+            targets.append(self.node(state))
+            weights.append(weight)
+        return targets, weights
+
+
+def _goal(goal: int | Callable[[int], bool] | None) -> tuple[int, Callable | None]:
+    """Split a goal into a node to compare with and a test to call, comparing
+    is a lot cheaper than calling for every node taken from the queue.
+    """
+    if callable(goal):
+        return -1, goal
+    return (-1 if goal is None else goal), None
+
+
+def _grow(distance: list, graph: Graph) -> None:
+    """Make room for the states a StateGraph numbered since the last look."""
+    if len(distance) < graph.size:
+        distance.extend([math.inf] * (graph.size - len(distance)))
+
+
+def dijkstra(
+    graph: Graph,
+    start: int,
+    goal: int | Callable[[int], bool] | None = None,
+    stats: SearchStats | None = None,
+) -> int | list[int] | None:
+    """Find the cheapest way from the start node with a binary heap.
+
+    Args:
+        graph (Graph): The graph to search, edge weights must not be negative.
+        start (int): The node to start from.
+        goal (int | Callable | None, optional): The node to reach or a test
+            whether a node is a goal. Without one every node is searched.
+        stats (SearchStats | None, optional): Counters to add the work to.
+
+    Returns:
+        int | list[int] | None: The cost of the first goal found or None if it
+            cannot be reached. Without a goal the costs to all nodes, with
+            math.inf for unreachable ones.
+    """
+    goal_node, is_goal = _goal(goal)
+    growing = isinstance(graph, StateGraph)
+    if not growing:
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    heappush, heappop = heapq.heappush, heapq.heappop
+    distance = [math.inf] * max(graph.size, start + 1)
+    distance[start] = 0
+    queue = [(0, start)]
+    expanded = pushes = pops = 0
+    result = None
+    while queue:
+        cost, node = heappop(queue)
+        pops += 1
+        if cost > distance[node]:
+            continue
+        if node == goal_node or is_goal and is_goal(node):
+            result = cost
+            break
+        expanded += 1
+        if growing:
+            targets, weights = graph.expand(node)
+            first, last = 0, len(targets)
+            _grow(distance, graph)
+        else:
+            first, last = offsets[node], offsets[node + 1]
+        for edge in range(first, last):
+            target = targets[edge]
+            new_cost = cost + weights[edge]
+            if new_cost < distance[target]:
+                distance[target] = new_cost
+                heappush(queue, (new_cost, target))
+                pushes += 1
+    if stats is not None:
+        stats.add(expanded, pushes + 1, pops)
+    return distance if goal is None else result
+
+
+def astar(
+    graph: Graph,
+    start: int,
+    goal: int | Callable[[int], bool],
+    heuristic: Callable[[int], float] | list[float],
+    stats: SearchStats | None = None,
+) -> int | None:
+    """Dijkstra that looks at the nodes with the lowest estimated total first.
+
+    The heuristic estimates the remaining cost from a node. It has to be
+    consistent to find the cheapest way, a heavier one trades accuracy for
+    fewer expanded nodes.
+
+    Args:
+        heuristic (Callable | list): The estimate as a function of the node or
+            a list indexed by node.
+
+    See dijkstra for the other arguments and the result.
+    """
+    goal_node, is_goal = _goal(goal)
+    growing = isinstance(graph, StateGraph)
+    if not growing:
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    if not callable(heuristic):
+        heuristic = heuristic.__getitem__
+    heappush, heappop = heapq.heappush, heapq.heappop
+    distance = [math.inf] * max(graph.size, start + 1)
+    distance[start] = 0
+    queue = [(heuristic(start), 0, start)]
+    expanded = pushes = pops = 0
+    result = None
+    while queue:
+        _, cost, node = heappop(queue)
+        pops += 1
+        if cost > distance[node]:
+            continue
+        if node == goal_node or is_goal and is_goal(node):
+            result = cost
+            break
+        expanded += 1
+        if growing:
+            targets, weights = graph.expand(node)
+            first, last = 0, len(targets)
+            _grow(distance, graph)
+        else:
+            first, last = offsets[node], offsets[node + 1]
+        for edge in range(first, last):
+            target = targets[edge]
+            new_cost = cost + weights[edge]
+            if new_cost < distance[target]:
+                distance[target] = new_cost
+                heappush(queue, (new_cost + heuristic(target), new_cost, target))
+                pushes += 1
+    if stats is not None:
+        stats.add(expanded, pushes + 1, pops)
+    return result
+
+
+def bucket_dijkstra(
+    graph: Graph,
+    start: int,
+    goal: int | Callable[[int], bool] | None = None,
+    max_weight: int | None = None,
+    stats: SearchStats | None = None,
+) -> int | list[int] | None:
+    """Dijkstra with a circular array of buckets instead of a heap (Dial's
+    algorithm). Pushing and popping are O(1), which pays off for small integer
+    weights like the risk levels of a map.
+
+    Args:
+        max_weight (int | None, optional): The largest edge weight, looked up
+            in the graph if not given. Required for a StateGraph, whose edges
+            are not known up front. Heavier edges give wrong results.
+
+    Raises:
+        ValueError: If max_weight is missing for a StateGraph.
+
+    See dijkstra for the other arguments and the result.
+    """
+    goal_node, is_goal = _goal(goal)
+    growing = isinstance(graph, StateGraph)
+    if max_weight is None and growing:
+        raise ValueError("bucket_dijkstra needs max_weight for a StateGraph")
+    if not growing:
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    if max_weight is None:
+        max_weight = max(weights, default=0)
+    buckets = [[] for _ in range(max_weight + 1)]
+    distance = [math.inf] * max(graph.size, start + 1)
+    distance[start] = 0
+    buckets[0].append(start)
+    queued = 1
+    cost = 0
+    expanded = pushes = pops = 0
+    result = None
+    while queued:
+        bucket = buckets[cost % len(buckets)]
+        while bucket:
+            node = bucket.pop()
+            queued -= 1
+            pops += 1
+            if distance[node] != cost:
+                continue
+            if node == goal_node or is_goal and is_goal(node):
+                result = cost
+                queued = 0
+                break
+            expanded += 1
+            if growing:
+                targets, weights = graph.expand(node)
+                first, last = 0, len(targets)
+                _grow(distance, graph)
+            else:
+                first, last = offsets[node], offsets[node + 1]
+            for edge in range(first, last):
+                target = targets[edge]
+                new_cost = cost + weights[edge]
+                if new_cost < distance[target]:
+                    distance[target] = new_cost
+                    buckets[new_cost % len(buckets)].append(target)
+                    queued += 1
+                    pushes += 1
+        cost += 1
+    if stats is not None:
+        stats.add(expanded, pushes + 1, pops)
+    return distance if goal is None else result
+
+
+def bfs(
+    graph: Graph,
+    start: int,
+    goal: int | Callable[[int], bool] | None = None,
+    stats: SearchStats | None = None,
+) -> int | list[int] | None:
+    """Count the fewest edges from the start node, ignoring the weights.
+
+    See dijkstra for the arguments and the result.
+    """
+    goal_node, is_goal = _goal(goal)
+    growing = isinstance(graph, StateGraph)
+    if not growing:
+        offsets, targets = graph.offsets, graph.targets
+    distance = [math.inf] * max(graph.size, start + 1)
+    distance[start] = 0
+    queue = deque([start])
+    expanded = pushes = pops = 0
+    result = None
+    while queue:
+        node = queue.popleft()
+        pops += 1
+        if node == goal_node or is_goal and is_goal(node):
+            result = distance[node]
+            break
+        expanded += 1
+        if growing:
+            targets, _ = graph.expand(node)
+            first, last = 0, len(targets)
+            _grow(distance, graph)
+        else:
+            first, last = offsets[node], offsets[node + 1]
+        for target in targets[first:last]:
+            if distance[target] == math.inf:
+                distance[target] = distance[node] + 1
+                queue.append(target)
+                pushes += 1
+    if stats is not None:
+        stats.add(expanded, pushes + 1, pops)
+    return distance if goal is None else result
+
+
+# ==============================================================================
+# Memoization
+
+
+_MISSING = object()
+
+
+class _KeywordMark:
+    """Separates the positional from the keyword arguments in memoization
+    keys like the marker of functools._make_key, but survives pickling.
+    """
+
+    __slots__ = ()
+
+    def __reduce__(self) -> str:
+        return "_KEYWORD_MARK"
+
+
+_KEYWORD_MARK = _KeywordMark()
+
+
+def deep_sizeof(value: any) -> int:
+    """Estimate the bytes a value takes, including the items of containers."""
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item) for item in value)
+    elif isinstance(value, dict):
+        size += sum(deep_sizeof(key) + deep_sizeof(item) for key, item in value.items())
+    return size
+
+
+class LRUCache:
+    """A mapping that forgets the least recently used items beyond its limits.
+
+    It counts how often a looked up key was there and how often items had to
+    be evicted, so the limits can be tuned against the hit rate. Measuring the
+    bytes of every item with deep_sizeof is slow, so it is only done with a
+    byte limit.
+
+    Attributes:
+        maxsize (int | None): How many items it holds at most.
+        max_bytes (int | None): How many bytes the keys and values may take.
+        bounded (bool): Whether there is any limit.
+        data (OrderedDict): The items from least to most recently used.
+        bytes (int): The estimated size of all items if max_bytes is set.
+        hits (int): How many lookups found their key.
+        misses (int): How many lookups did not.
+        evictions (int): How many items were dropped to fit the limits.
+    """
+
+    maxsize: int | None
+    max_bytes: int | None
+    bounded: bool
+    data: OrderedDict
+    bytes: int
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self, maxsize: int | None = None, max_bytes: int | None = None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.bounded = maxsize is not None or max_bytes is not None
+        self.clear()
+
+    def get(self, key: any, default: any = None) -> any:
+        """Look a key up, marking it as recently used and counting the outcome."""
+        value = self.data.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        if self.bounded:
+            self.data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: any, value: any) -> None:
+        if not self.bounded:
+            self.data[key] = value
+            return
+        if self.max_bytes is not None:
+            size = deep_sizeof(key) + deep_sizeof(value)
+            self.bytes += size - self._sizes.get(key, 0)
+            self._sizes[key] = size
+        self.data[key] = value
+        self.data.move_to_end(key)
+        while (self.maxsize is not None and len(self.data) > self.maxsize) or (
+            self.max_bytes is not None and self.bytes > self.max_bytes
+        ):
+            evicted, _ = self.data.popitem(last=False)
+            self.bytes -= self._sizes.pop(evicted, 0)
+            self.evictions += 1
+
+    def __contains__(self, key: any) -> bool:
+        return key in self.data
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def update(self, items: dict) -> None:
+        """Add items without counting them as lookups."""
+        for key, value in items.items():
+            self[key] = value
+
+    def clear(self) -> None:
+        """Remove all items and reset the counters."""
+        self.data = OrderedDict()
+        self._sizes = {}
+        self.bytes = self.hits = self.misses = self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """The share of lookups that found their key."""
+        return self.hits / (self.hits + self.misses) if self.hits else 0.0
+
+
+class Memoized:
+    """A memoizing function wrapper with an LRUCache as its store.
+
+    Use memoize below to create one and Timer.track to see how well it works.
+    Methods can be wrapped too, the instance is then part of the key like with
+    functools.lru_cache.
+
+    Attributes:
+        function (Callable): The wrapped function.
+        store (LRUCache): The results by arguments.
+    """
+
+    function: Callable
+    store: LRUCache
+
+    def __init__(self, function: Callable, maxsize: int | None, max_bytes: int | None):
+        functools.update_wrapper(self, function)
+        self.function = function
+        self.store = LRUCache(maxsize, max_bytes)
+        self._prepared = False
+
+    def __call__(self, *args, **kwargs) -> any:
+        # LRUCache.get inlined, as this is called a lot from recursive solvers
+        if not self._prepared:
+            self._prepare()
+        key = (*args, _KEYWORD_MARK, *sorted(kwargs.items())) if kwargs else args
+        store = self.store
+        value = store.data.get(key, _MISSING)
+        if value is _MISSING:
+            store.misses += 1
+            value = self.function(*args, **kwargs)
+            if store.bounded:
+                store[key] = value
+            else:
+                store.data[key] = value
+        else:
+            store.hits += 1
+            if store.bounded:
+                store.data.move_to_end(key)
+        return value
+
+    def __get__(self, instance: any, owner: type | None = None) -> any:
+        """Bind to the instance when wrapping a method."""
+        if instance is None:
+            return self
+        return types.MethodType(self, instance)
+
+    def _prepare(self) -> None:
+        """Called before the first lookup."""
+        self._prepared = True
+
+    def cache_clear(self) -> None:
+        """Forget all results and reset the counters, like functools.cache."""
+        self.store.clear()
+        self._prepared = False
+
+
+def memoize(
+    function: Callable | None = None,
+    *,
+    maxsize: int | None = None,
+    max_bytes: int | None = None,
+) -> Memoized | Callable[[Callable], Memoized]:
+    """Like functools.lru_cache, but with a byte limit and eviction counters.
+
+    Without limits it behaves like functools.cache. Use it like
+
+        @aoc.memoize(maxsize=100_000, max_bytes=256 * 2**20)
+        def solutions(step: int, z: int) -> list[str]:
+            ...
+
+    Args:
+        function (Callable | None, optional): The function to wrap.
+        maxsize (int | None, optional): How many results are kept at most.
+        max_bytes (int | None, optional): How many bytes results may take.
+
+    Returns:
+        Memoized | Callable[[Callable], Memoized]: The wrapped function or,
+            without a function, a decorator.
+    """
+    if function is None:
+        return lambda function: Memoized(function, maxsize, max_bytes)
+    return Memoized(function, maxsize, max_bytes)
+
+
+class PersistentCache(Memoized):
+    """A memoizing wrapper that keeps its results on disk between runs.
+
+    The results live in an SQLite database next to the inputs. They are
+    stored per namespace, which is made of the qualified function name, a hash
+    of the file that defines it and the hash of the input of the current day. So a
+    changed solver or input starts with an empty cache and closures over the
+    parsed input are fine. Outside of a day script the input is left out.
+
+    All results of a namespace are pickled together, as unpickling them one
+    by one takes longer than computing them for most days. They are loaded
+    into the store on the first call and written back by flush, which happens
+    at exit and after every day of the runner. If another process wrote the
+    namespace in the meantime both are merged. After writing, the least
+    recently used namespaces are evicted until the database fits its limits.
+    A namespace that does not fit on its own is not stored at all.
+
+    Use persistent_cache below to create one.
+
+    Attributes:
+        disk_entries (int): How many results the database may hold at most.
+        disk_bytes (int): How many bytes of pickled results it may hold.
+    """
+
+    disk_entries: int
+    disk_bytes: int
+
+    def __init__(
+        self,
+        function: Callable,
+        maxsize: int | None,
+        max_bytes: int | None,
+        disk_entries: int,
+        disk_bytes: int,
+    ):
+        super().__init__(function, maxsize, max_bytes)
+        self.disk_entries = disk_entries
+        self.disk_bytes = disk_bytes
+        self._flushed_misses = 0
+        self._namespace = None
+        self._version = None
+        _persistent_caches.add(self)
+
+    @property
+    def pending(self) -> int:
+        """How many results were computed since the last flush."""
+        return self.store.misses - self._flushed_misses
+
+    @property
+    def database(self) -> Path:
+        """The SQLite file shared by all persistent caches."""
+        return sidecar_directory() / "persistent-cache.sqlite"
+
+    def _connect(self) -> "sqlite3.Connection":
+        """Open the database, transactions are started explicitly."""
+        import sqlite3
+
+        self.database.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.database, timeout=60, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS results (namespace TEXT PRIMARY KEY,"
+            " results BLOB, entries INTEGER, size INTEGER, version REAL,"
+            " last_used REAL)"
+        )
+        return connection
+
+    def _prepare(self) -> None:
+        """Hold on to the cache until it is flushed and, on the first call,
+        determine the namespace and load its results.
+        """
+        import pickle
+
+        self._prepared = True
+        _unflushed_caches.add(self)
+        if self._namespace is not None:
+            return
+        self._namespace = self._make_namespace()
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                "UPDATE results SET last_used = ? WHERE namespace = ?"
+                " RETURNING results, version",
+                (time.time(), self._namespace),
+            ).fetchone()
+        finally:
+            connection.close()
+        if row is not None:
+            self.store.update(pickle.loads(row[0]))
+            self._version = row[1]
+
+    def _make_namespace(self) -> str:
+        """The qualified name, a hash of the defining file and, if the day is
+        known and its input downloaded, the hash of the input.
+
+        Not the module name, which is __main__ for a script but not for the
+        runner, so both share their results. Functions without a source file,
+        like those defined interactively, hash their code instead.
+        """
+        import inspect
+
+        try:
+            source = Path(inspect.getsourcefile(self.function)).read_bytes()
+            code_hash = hashlib.sha256(source).hexdigest()[:16]
+        except (TypeError, OSError):
+            code_hash = _code_identity(self.function.__code__)
+        parts = [self.function.__qualname__, code_hash]
+        try:
+            day = guess_day_from_filename()
+        except ValueError:
+            day = None
+        if day is not None and cache_file_for_day(day).exists():
+            parts.append(input_hash(day)[:16])
+        return ":".join(parts)
+
+    def flush(self) -> None:
+        """Write the new results to disk and evict old ones beyond the limits.
+
+        Afterwards the cache is only weakly referenced until it is called
+        again, so caches of closures do not outlive their day.
+        """
+        import pickle
+
+        _unflushed_caches.discard(self)
+        self._prepared = False
+        if not self.pending:
+            return
+        self._flushed_misses = self.store.misses
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                "SELECT results, version FROM results WHERE namespace = ?",
+                (self._namespace,),
+            ).fetchone()
+            results = dict(self.store.data)
+            if row is not None and row[1] != self._version:
+                results = pickle.loads(row[0]) | results
+            if len(results) <= self.disk_entries:
+                self._store(connection, results)
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+
+    def _store(self, connection: "sqlite3.Connection", results: dict) -> None:
+        """Write all results of the namespace if they fit the size limit."""
+        import pickle
+
+        pickled = pickle.dumps(results, pickle.HIGHEST_PROTOCOL)
+        if len(pickled) > self.disk_bytes:
+            return
+        self._version = now = time.time()
+        connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+            (self._namespace, pickled, len(results), len(pickled), now, now),
+        )
+        self._evict(connection)
+
+    def _evict(self, connection: "sqlite3.Connection") -> None:
+        """Delete the least recently used namespaces beyond the limits."""
+        entries, size = connection.execute(
+            "SELECT SUM(entries), SUM(size) FROM results"
+        ).fetchone()
+        doomed = []
+        for namespace, namespace_entries, namespace_size in connection.execute(
+            "SELECT namespace, entries, size FROM results ORDER BY last_used"
+        ):
+            if entries <= self.disk_entries and size <= self.disk_bytes:
+                break
+            doomed.append((namespace,))
+            entries, size = entries - namespace_entries, size - namespace_size
+        connection.executemany("DELETE FROM results WHERE namespace = ?", doomed)
+
+    def cache_clear(self) -> None:
+        """Forget the results of this process, like functools.cache."""
+        super().cache_clear()
+        self._flushed_misses = 0
+        self._namespace = None
+        self._version = None
+
+
+_persistent_caches: weakref.WeakSet[PersistentCache] = weakref.WeakSet()
+# strong references to the caches with results that might not be flushed yet,
+# the cache of a closure would otherwise be collected together with it
+_unflushed_caches: set[PersistentCache] = set()
+
+
+def persistent_cache(
+    function: Callable | None = None,
+    *,
+    maxsize: int | None = None,
+    max_bytes: int | None = None,
+    disk_entries: int = PERSISTENT_CACHE_MAX_ENTRIES,
+    disk_bytes: int = PERSISTENT_CACHE_MAX_BYTES,
+) -> PersistentCache | Callable[[Callable], PersistentCache]:
+    """Like memoize, but the results survive the process.
+
+    The function has to be pure given the input of the day, its arguments
+    hashable and its results picklable. The limits of memoize apply to the
+    results in memory, which are also the ones written to disk. Use it like
+
+        @aoc.persistent_cache
+        def victories(pawn: int, score: int) -> tuple[int, int]:
+            ...
+
+        @aoc.persistent_cache(maxsize=100_000, disk_entries=10_000_000)
+        def expensive(...):
+            ...
+
+    Args:
+        function (Callable | None, optional): The function to wrap.
+        maxsize (int | None, optional): See memoize.
+        max_bytes (int | None, optional): See memoize.
+        disk_entries (int, optional): See PersistentCache.
+        disk_bytes (int, optional): See PersistentCache.
+
+    Returns:
+        PersistentCache | Callable[[Callable], PersistentCache]: The wrapped
+            function or, without a function, a decorator.
+    """
+    limits = maxsize, max_bytes, disk_entries, disk_bytes
+    if function is None:
+        return lambda function: PersistentCache(function, *limits)
+    return PersistentCache(function, *limits)
+
+
+def flush_persistent_caches() -> None:
+    """Write the new results of all persistent caches to disk."""
+    for persistent in {*_unflushed_caches, *_persistent_caches}:
+        persistent.flush()
+
+
+atexit.register(flush_persistent_caches)
+
+
+# ==============================================================================
+# Timing code runtime
+
+
+def format_table(rows: list[list[str]], footer: list[str]) -> str:
+    """Format rows in the box-drawn layout of the timer tables.
+
+    The first row is the header. The first column is aligned left, all others
+    are aligned right. The body is only drawn if it has more than one row, as
+    it would just repeat the footer otherwise.
+
+    Args:
+        rows (list[list[str]]): The header followed by the body rows.
+        footer (list[str]): The row summing up the body, e.g. "Total".
+
+    Returns:
+        str: The table.
+    """
+    header, *body = rows
+    widths = [
+        max(len(row[column]) for row in [*rows, footer])
+        for column in range(len(header))
+    ]
+
+    def line(row: list[str]) -> str:
+        return "    ".join(
+            cell.ljust(width) if index == 0 else cell.rjust(width)
+            for index, (cell, width) in enumerate(zip(row, widths))
+        ).rstrip()
+
+    toprule = "━" * (sum(widths) + 4 * (len(widths) - 1))
+    midrule = "─" * len(toprule)
+    bottomrule = toprule
+
+    lines = [toprule, line(header), midrule]
+    if len(body) > 1:
+        lines.extend(line(row) for row in body)
+        lines.append(midrule)
+    lines.extend([line(footer), bottomrule])
+    return "\n".join(lines)
+
+
+RECORD_FIELDS = [
+    "day",
+    "index",
+    "section",
+    "ms",
+    "runs",
+    "min",
+    "median",
+    "mean",
+    "p95",
+    "std",
+    "peak_bytes",
+    "net_bytes",
+    "rss_bytes",
+    "python",
+    "input_hash",
+    "timestamp",
+]
+
+
+def format_bytes(size: int) -> str:
+    """Format a number of bytes in MiB."""
+    return f"{size / 2**20:.03f} MiB"
+
+
+def resident_set_size() -> int:
+    """The current resident set size of the process in bytes.
+
+    Where /proc is not available the peak resident set size is returned.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _function_name(function: tuple[str, int, str]) -> str:
+    """A short name for a function in profiler stats."""
+    filename, line, name = function
+    if filename == "~":
+        return name
+    return f"{name} ({Path(filename).name}:{line})"
+
+
+def _drop_functions(stats: pstats.Stats, dropped: set[tuple]) -> None:
+    """Remove functions from profiler stats as if they had not been called.
+
+    Their share is taken off the functions they called. Functions that were
+    only called by dropped ones are dropped too.
+    """
+    while dropped:
+        for function in dropped:
+            stats.stats.pop(function, None)
+        orphans = set()
+        for function, (primitive, calls, own, cumulative, callers) in [
+            *stats.stats.items()
+        ]:
+            # the callers map to (calls, primitive calls, own, cumulative time)
+            shares = [callers.pop(caller) for caller in dropped & callers.keys()]
+            if shares and not callers:
+                orphans.add(function)
+            elif shares:
+                calls -= sum(share[0] for share in shares)
+                primitive -= sum(share[1] for share in shares)
+                own -= sum(share[2] for share in shares)
+                cumulative -= sum(share[3] for share in shares)
+                stats.stats[function] = (primitive, calls, own, cumulative, callers)
+        dropped = orphans
+
+
+def collapsed_stacks(stats: pstats.Stats) -> list[str]:
+    """Convert profiler stats to collapsed stacks for flame graph tools.
+
+    cProfile only records callers, not whole stacks. The stacks are rebuilt by
+    walking the call graph from the functions without callers and splitting
+    the time of a function among its callers in proportion to the time spent
+    on behalf of each. Recursion is cut off, so this is an approximation.
+
+    Args:
+        stats (pstats.Stats): The stats of a profiler.
+
+    Returns:
+        list[str]: Lines like "main;solve;sum 1234" with microseconds of own
+            time per stack.
+    """
+    callees: dict[tuple, list[tuple[tuple, float]]] = {}
+    for function, (*_, callers) in stats.stats.items():
+        for caller, (*_, cumulative_time) in callers.items():
+            callees.setdefault(caller, []).append((function, cumulative_time))
+
+    lines = []
+
+    def walk(function: tuple, stack: list[tuple], share: float) -> None:
+        _, _, own_time, cumulative_time, _ = stats.stats[function]
+        stack = [*stack, function]
+        if (microseconds := round(own_time * share * 1e6)) > 0:
+            lines.append(f"{';'.join(map(_function_name, stack))} {microseconds}")
+        for callee, time_for_caller in callees.get(function, []):
+            callee_time = stats.stats[callee][3]
+            if callee not in stack and callee_time and time_for_caller * share:
+                walk(callee, stack, share * time_for_caller / callee_time)
+
+    for function, (*_, callers) in stats.stats.items():
+        if not callers:
+            walk(function, [], 1.0)
+    return lines
+
+
+def run_metadata(day: str) -> dict[str, str | None]:
+    """The fields describing the circumstances of a timed run of a day."""
+    import platform
+    from datetime import datetime, timezone
+
+    try:
+        digest = input_hash(int(day)) if cache_file_for_day(int(day)).exists() else None
+    except ValueError:
+        digest = None
+    return {
+        "python": f"{platform.python_implementation()} {platform.python_version()}",
+        "input_hash": digest,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def day_key(day: int | str) -> str:
+    """The day field of timing records: two digits, followed by the variant for
+    scripts like `02-alternate.py`, so records of standalone runs, the runner
+    and bench.py match up. Older records with plain numbers are padded.
+    """
+    day = str(day)
+    if not day.isdigit():
+        return day
+    stem = Path(sys.argv[0]).stem
+    if CURRENT_DAY is None and re.fullmatch(r"\d\d-[\w-]+", stem):
+        if int(stem[:2]) == int(day):
+            return stem
+    return f"{int(day):02d}"
+
+
+def _record_key(record: dict[str, any]) -> tuple[str, int, str]:
+    day = str(record["day"])
+    return (
+        f"{int(day):02d}" if day.isdigit() else day,
+        int(record["index"]),
+        record["section"],
+    )
+
+
+def export_records(records: list[dict[str, any]], path: str | Path) -> None:
+    """Append timing records to a CSV file or, for other suffixes, JSON lines.
+
+    Args:
+        records (list[dict[str, any]]): Records with keys from RECORD_FIELDS.
+        path (str | Path): The file to append to.
+    """
+    import csv
+
+    path = Path(path)
+    if path.suffix == ".csv":
+        is_new = not path.exists() or not path.stat().st_size
+        with path.open("a", newline="") as file:
+            writer = csv.DictWriter(file, RECORD_FIELDS, restval="")
+            if is_new:
+                writer.writeheader()
+            writer.writerows(records)
+    else:
+        with path.open("a") as file:
+            file.writelines(json.dumps(record) + "\n" for record in records)
+
+
+def load_records(path: str | Path) -> list[dict[str, any]]:
+    """Load timing records written by export_records.
+
+    Args:
+        path (str | Path): The CSV or JSON lines file.
+
+    Returns:
+        list[dict[str, any]]: The records in the order they were written.
+    """
+    import csv
+
+    path = Path(path)
+    if path.suffix != ".csv":
+        return [json.loads(line) for line in path.read_text().splitlines() if line]
+    with path.open(newline="") as file:
+        return [
+            {key: value for key, value in row.items() if value != ""}
+            for row in csv.DictReader(file)
+        ]
+
+
+def find_regressions(
+    records: list[dict[str, any]],
+    baseline: list[dict[str, any]],
+    threshold: float = REGRESSION_THRESHOLD,
+) -> list[str]:
+    """Compare timing records with the latest matching baseline records.
+
+    Records match if they have the same day, section index and label. Both
+    the time and, where both records have it, the peak memory are compared.
+    Growth below REGRESSION_MIN_MS or REGRESSION_MIN_BYTES is ignored. If no
+    record matches at all, a warning is printed as the gate checks nothing.
+
+    Args:
+        records (list[dict[str, any]]): The records of the current run.
+        baseline (list[dict[str, any]]): The records to compare against.
+        threshold (float, optional): The allowed relative slowdown.
+
+    Returns:
+        list[str]: A description of every section that got slower.
+    """
+    baseline_records = {_record_key(record): record for record in baseline}
+    regressions = []
+    matched = 0
+    for record in records:
+        key = _record_key(record)
+        if (reference := baseline_records.get(key)) is None:
+            continue
+        matched += 1
+        for field, floor, format_value in [
+            ("ms", REGRESSION_MIN_MS, lambda value: f"{value:.03f} ms"),
+            ("peak_bytes", REGRESSION_MIN_BYTES, format_bytes),
+        ]:
+            if field not in record or field not in reference:
+                continue
+            value, reference_value = float(record[field]), float(reference[field])
+            # tiny sections are all noise, however much they grow relatively
+            if value - reference_value < floor:
+                continue
+            if reference_value == 0:
+                growth = "new"
+            elif value > reference_value * (1 + threshold):
+                growth = f"+{value / reference_value - 1:.0%}"
+            else:
+                continue
+            regressions.append(
+                f"Day {record['day']} {record['section'] or key[1]} {field}:"
+                f" {format_value(value)}, baseline {format_value(reference_value)}"
+                f" ({growth})"
+            )
+    if records and baseline and not matched:
+        days = sorted({key[0] for key in map(_record_key, records)})
+        print(
+            f"Warning> no baseline record matches day {', '.join(days)}",
+            file=sys.stderr,
+        )
+    return regressions
+
+
+def report_records(
+    records: list[dict[str, any]],
+    export: str | Path | None,
+    baseline: str | Path | None,
+    threshold: float,
+) -> None:
+    """Export records and exit non-zero if they regress against a baseline.
+
+    Args:
+        records (list[dict[str, any]]): The records of the current run.
+        export (str | Path | None): Where to append the records, if anywhere.
+        baseline (str | Path | None): The export to compare against, if any.
+        threshold (float): The allowed relative slowdown.
+
+    Raises:
+        SystemExit: If any section is slower than the baseline allows.
+    """
+    # read first, the baseline may be the file the records get appended to
+    reference = None
+    if baseline and Path(baseline).exists():
+        reference = load_records(baseline)
+    elif baseline:
+        print(f"Warning> there is no baseline at {baseline} yet", file=sys.stderr)
+    if export:
+        export_records(records, export)
+    if reference is not None and (
+        regressions := find_regressions(records, reference, threshold)
+    ):
+        for regression in regressions:
+            print("Regression>", regression)
+        raise SystemExit(1)
+
+
+class Timer:
+    """Used to time days.
+
+    Usage like:
+
+        with aoc.Timer() as timer:
+            part1()
+            timer.mark()
+            part2()
+
+    It will automatically print a timed table. The initializer can get a custom
+    day name if you feel like it. If you don't call mark it will be timed as one
+    piece. I prefer to use it as
+
+        import aoc
+
+        def main(timer: aoc.Timer) -> None:
             # part 1 code
             timer.mark()
             # part 2 code
@@ -366,9 +2768,40 @@ class Timer:
     section. The ones which you do not provide a title for will be labeled
     "Part 1", "Part 2" and "Postprocessing" in order. The ones after will not
     receive a label.
+
+    Timestamps are taken with `time.perf_counter_ns`. For sections that only
+    take fractions of a millisecond a single run is too noisy, use benchmark
+    below to run main several times and get statistics per section instead.
+
+    Timers that are not silent can append their timings as records to a file
+    given with `export` (CSV for a .csv suffix, JSON lines otherwise). Given a
+    previous export as `baseline` every section more than `threshold` slower
+    than there is reported and the program exits with status 1. Both default
+    to TIMER_EXPORT and TIMER_BASELINE, so they can be set for every day at
+    once through the environment:
+
+        AOC_TIMER_EXPORT=times.jsonl AOC_TIMER_BASELINE=base.jsonl ./12.py
+
+    With `memory=True` (or $AOC_TIMER_MEMORY set) allocations are traced with
+    tracemalloc. For every section the peak and the net change of traced
+    memory and the resident set size at its end are shown and exported. The
+    tracing slows the code down, so compare such timings only among each
+    other.
+
+    With `profile=True` (or $AOC_TIMER_PROFILE set) every section is profiled
+    with its own cProfile profiler. The `profile_top` functions with the most
+    cumulative time are listed under the row of each section. If a
+    `profile_dump` directory is given the stats are also written there as
+    `<day>-<index>-<label>.prof` files for pstats and snakeviz, and as
+    `.collapsed` stacks for flame graph tools. The bookkeeping of the timer
+    itself is left out of the profiles.
+
+    Functions wrapped by memoize or persistent_cache can be passed to
+    `timer.track` to list their hits, misses, evictions and the size of their
+    store below the table.
     """
 
-    times: list[float]
+    times: list[int]
     sections: list[str]
     remaining_labels: list[str]
     finished: bool = False
@@ -376,13 +2809,47 @@ class Timer:
 
     day: str = ""
 
-    def __init__(self, day: any | None = None, silent: bool = False):
+    export: str | Path | None
+    baseline: str | Path | None
+    threshold: float
+    memory: bool
+    memory_usage: list[tuple[int, int, int]]
+    profile: bool
+    profile_top: int
+    profile_dump: str | Path | None
+    profiles: list[pstats.Stats]
+    tracked: list[Memoized]
+
+    def __init__(
+        self,
+        day: any | None = None,
+        silent: bool = False,
+        export: str | Path | None = None,
+        baseline: str | Path | None = None,
+        threshold: float | None = None,
+        memory: bool | None = None,
+        profile: bool | None = None,
+        profile_top: int = 10,
+        profile_dump: str | Path | None = None,
+    ):
         self.day = str(day) if day is not None else str(guess_day_from_filename())
         self.remaining_labels = ["Part 1", "Part 2", "Postprocessing"]
         self.times = []
         self.sections = []
         self.finished = False
         self.silent = silent
+        self.export = export or TIMER_EXPORT
+        self.baseline = baseline or TIMER_BASELINE
+        self.threshold = REGRESSION_THRESHOLD if threshold is None else threshold
+        self.memory = TIMER_MEMORY if memory is None else memory
+        self.memory_usage = []
+        self._started_tracing = False
+        self.profile = TIMER_PROFILE if profile is None else profile
+        self.profile_top = profile_top
+        self.profile_dump = profile_dump
+        self.profiles = []
+        self._profiler = None
+        self.tracked = []
 
     def next_label(self) -> str:
         """Get the next automatically computed label
@@ -394,17 +2861,69 @@ class Timer:
         return self.remaining_labels.pop(0) if self.remaining_labels else ""
 
     def __enter__(self) -> Timer:
-        self.times = [time.time()]
+        if self.memory:
+            import tracemalloc
+
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._traced_at_start = tracemalloc.get_traced_memory()[0]
+        self.times = [time.perf_counter_ns()]
+        self._start_profiler()
         return self
 
+    def _start_profiler(self) -> None:
+        """Start profiling the next section if profiling is enabled."""
+        if self.profile:
+            # pstats as well, importing it later would be profiled
+            import cProfile
+            import pstats  # noqa: F401
+
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def _stop_profiler(self) -> pstats.Stats | None:
+        """Stop profiling the current section and return its stats."""
+        if self._profiler is None:
+            return None
+        import pstats
+
+        self._profiler.disable()
+        profiler, self._profiler = self._profiler, None
+        stats = pstats.Stats(profiler)
+        # the bookkeeping of the timer between the section and the disable call
+        _drop_functions(stats, _TIMER_FRAMES & stats.stats.keys())
+        return stats
+
+    def _end_section(self, label: str) -> None:
+        """Take the timestamp, memory usage and profile at the end of a section."""
+        self.times.append(time.perf_counter_ns())
+        if (stats := self._stop_profiler()) is not None:
+            self.profiles.append(stats)
+        self.sections.append(label)
+        if self.memory:
+            import tracemalloc
+
+            current, peak = tracemalloc.get_traced_memory()
+            self.memory_usage.append(
+                (
+                    peak - self._traced_at_start,
+                    current - self._traced_at_start,
+                    resident_set_size(),
+                )
+            )
+            tracemalloc.reset_peak()
+            self._traced_at_start = current
+        self._start_profiler()
+
     def mark(self, name: str = None) -> None:
         """Mark the end current part or section.
 
         Args:
             name (str, optional): The name of the section. Autolabeled usually.
         """
-        self.times.append(time.time())
-        self.sections.append(name or self.next_label())
+        self._end_section(name or self.next_label())
 
     def last_mark(self, name: str = None) -> None:
         """Mark the end current part or section. Don't start a sequence after.
@@ -415,45 +2934,568 @@ class Timer:
         self.mark(name)
         self.finished = True
 
+    @property
+    def durations(self) -> list[tuple[str, float]]:
+        """The label and the duration in milliseconds of every section."""
+        return [
+            (label, (time_b - time_a) / 1e6)
+            for (time_a, time_b), label in zip(pairwise(self.times), self.sections)
+        ]
+
+    @property
+    def total(self) -> float:
+        """The total duration in milliseconds."""
+        return (self.times[-1] - self.times[0]) / 1e6
+
+    @property
+    def total_memory_usage(self) -> tuple[int, int, int]:
+        """The highest peak, the overall net change and the final RSS."""
+        peaks, nets, resident_sizes = zip(*self.memory_usage)
+        return max(peaks), sum(nets), resident_sizes[-1]
+
+    def records(self) -> list[dict[str, any]]:
+        """The timings as records for export_records, the total included."""
+        metadata = run_metadata(self.day)
+        records = [
+            {"day": day_key(self.day), "index": index, "section": label, "ms": duration}
+            | metadata
+            for index, (label, duration) in enumerate(
+                [*self.durations, ("Total", self.total)]
+            )
+        ]
+        if self.memory:
+            for record, (peak, net, resident_size) in zip(
+                records, [*self.memory_usage, self.total_memory_usage]
+            ):
+                record |= {
+                    "peak_bytes": peak,
+                    "net_bytes": net,
+                    "rss_bytes": resident_size,
+                }
+        return records
+
+    def track(self, *functions: Memoized) -> None:
+        """Report the cache statistics of memoized functions at the end.
+
+        Args:
+            *functions (Memoized): Functions wrapped by memoize or
+                persistent_cache.
+        """
+        self.tracked.extend(functions)
+
+    def _cache_table(self) -> str:
+        """The statistics of the tracked caches as a table."""
+
+        def row(name: str, stores: list[LRUCache]) -> list[str]:
+            hits = sum(store.hits for store in stores)
+            misses = sum(store.misses for store in stores)
+            return [
+                name,
+                str(hits),
+                str(misses),
+                str(sum(store.evictions for store in stores)),
+                f"{hits / (hits + misses) if hits else 0:.1%}",
+                str(sum(len(store) for store in stores)),
+                format_bytes(sum(store.bytes for store in stores)),
+            ]
+
+        rows = [["Cache", "hits", "misses", "evictions", "hit rate", "entries", "size"]]
+        rows.extend(
+            row(function.__qualname__.rpartition(".")[2], [function.store])
+            for function in self.tracked
+        )
+        # with a single cache the body is not shown, so the footer is named
+        footer = row(
+            "Total" if len(rows) > 2 else rows[-1][0],
+            [function.store for function in self.tracked],
+        )
+        if not any(function.store.max_bytes for function in self.tracked):
+            # the sizes are only measured for caches with a byte limit
+            for cache_row in [*rows, footer]:
+                cache_row.pop()
+        return format_table(rows, footer)
+
+    def dump_profiles(self, directory: str | Path) -> None:
+        """Write the stats of every section as .prof and .collapsed files.
+
+        Args:
+            directory (str | Path): The directory to put the files into.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for index, (label, stats) in enumerate(zip(self.sections, self.profiles)):
+            slug = re.sub(r"[^\w-]+", "_", label).strip("_")
+            name = f"{self.day}-{index}-{slug}"
+            stats.dump_stats(directory / f"{name}.prof")
+            (directory / f"{name}.collapsed").write_text(
+                "".join(line + "\n" for line in collapsed_stacks(stats))
+            )
+
+    def _profile_rows(self, stats: pstats.Stats) -> list[list[str]]:
+        """Table rows with the functions of a section by cumulative time."""
+        functions = sorted(
+            stats.stats.items(), key=lambda item: item[1][3], reverse=True
+        )
+        return [
+            [f"  {_function_name(function)}", f"{cumulative_time * 1000:.03f} ms"]
+            for function, (_, _, _, cumulative_time, _) in functions[: self.profile_top]
+        ]
+
     def __exit__(self, exception_type, exception_value, traceback) -> None:
+        if self._profiler is not None:
+            self._profiler.disable()
         if not self.finished:
-            self.times.append(time.time())
-            self.sections.append(self.next_label())
+            self._end_section(self.next_label())
+        self._stop_profiler()
+        if self._started_tracing:
+            import tracemalloc
+
+            tracemalloc.stop()
+            self._started_tracing = False
+        if self.profile_dump is not None and self.profiles:
+            self.dump_profiles(self.profile_dump)
 
         if self.silent or exception_type is not None:
             return
 
-        self.times = [1000 * t for t in self.times]
+        rows = [["Day", self.day]]
+        rows.extend(
+            [label, f"{duration:.03f} ms"] for label, duration in self.durations
+        )
+        footer = ["Total", f"{self.total:.03f} ms"]
+        if self.memory:
+            rows[0].extend(["peak", "net", "RSS"])
+            for row, usage in zip(
+                [*rows[1:], footer], [*self.memory_usage, self.total_memory_usage]
+            ):
+                row.extend(format_bytes(size) for size in usage)
+        if self.profiles:
+            columns = len(rows[0])
+            rows[1:] = [
+                row
+                for section_row, stats in zip(rows[1:], self.profiles)
+                for row in [
+                    section_row,
+                    *(
+                        profile_row + [""] * (columns - 2)
+                        for profile_row in self._profile_rows(stats)
+                    ),
+                ]
+            ]
+        print(format_table(rows, footer))
+        if self.tracked:
+            print(self._cache_table())
+        if self.export or self.baseline:
+            report_records(self.records(), self.export, self.baseline, self.threshold)
+
+
+_TIMER_FRAMES = {
+    (code.co_filename, code.co_firstlineno, code.co_name)
+    for code in [
+        Timer.mark.__code__,
+        Timer.last_mark.__code__,
+        Timer._end_section.__code__,
+        Timer._stop_profiler.__code__,
+        Timer.__exit__.__code__,
+    ]
+} | {("~", 0, "<method 'disable' of '_lsprof.Profiler' objects>")}
+
+
+def _call_main(main: Callable, timer: Timer) -> None:
+    """Call the main function of a day, passing the timer if it takes one."""
+    import inspect
+
+    if inspect.signature(main).parameters:
+        main(timer)
+    else:
+        main()
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    """The nearest-rank percentile of some values."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def benchmark(
+    main: Callable,
+    runs: int = 10,
+    warmup: int = 1,
+    day: any | None = None,
+    export: str | Path | None = None,
+    baseline: str | Path | None = None,
+    threshold: float | None = None,
+) -> list[tuple[str, list[float]]]:
+    """Run the main function of a day repeatedly and print statistics.
+
+    main gets called `warmup` times without measuring and then `runs` times
+    with a silent Timer. Only the very first call may print, so answers show
+    up once. The table holds min, median, mean, 95th percentile and standard
+    deviation of every labelled section. Use it like
+
+        if __name__ == "__main__":
+            aoc.benchmark(main, runs=50, warmup=5)
 
-        label_length = max(len(label) for label in self.sections)
-        last_col_length = len(f"{self.times[-1] - self.times[0]:.03f}") + 3
+    Exports and baseline comparisons work like for Timer, comparing medians.
 
-        def separator(character: str, continuous: bool = True) -> str:
-            return (
-                (character * label_length)
-                + (character if continuous else " ") * 4
-                + (character * last_col_length)
-            )
+    Args:
+        main (Callable): The main function, with or without a timer argument.
+        runs (int, optional): How many runs are measured.
+        warmup (int, optional): How many runs are done before measuring.
+        day (any | None, optional): The day name, guessed by default.
+        export (str | Path | None, optional): See Timer.
+        baseline (str | Path | None, optional): See Timer.
+        threshold (float | None, optional): See Timer.
 
-        toprule = separator("━")
-        midrule = separator("─")
-        bottomrule = toprule
-
-        print(toprule)
-        print(f"{'Day'.ljust(label_length)}    {self.day.rjust(last_col_length)}")
-        print(midrule)
-        if len(self.times) > 2:
-            for (time_a, time_b), label in zip(pairwise(self.times), self.sections):
-                print(
-                    label.ljust(label_length)
-                    + "    "
-                    + f"{time_b - time_a:.03f} ms".rjust(last_col_length)
-                )
-            print(midrule)
-        print(
-            "Total".ljust(label_length)
-            + "    "
-            + f"{self.times[-1] - self.times[0]:.03f} ms".rjust(last_col_length)
+    Returns:
+        list[tuple[str, list[float]]]: The label and the durations in ms of
+            every section, followed by the totals labeled "Total".
+    """
+    import statistics
+
+    measured_runs: list[list[float]] = []
+    for run in range(warmup + runs):
+        with nullcontext() if run == 0 else redirect_stdout(io.StringIO()):
+            with Timer(day, silent=True, memory=False) as timer:
+                _call_main(main, timer)
+        if run >= warmup:
+            measured_runs.append(
+                [duration for _, duration in timer.durations] + [timer.total]
+            )
+    labels = [label for label, _ in timer.durations] + ["Total"]
+    samples = list(zip(labels, map(list, zip(*measured_runs))))
+
+    def summary(values: list[float]) -> dict[str, float]:
+        return {
+            "min": min(values),
+            "median": statistics.median(values),
+            "mean": statistics.fmean(values),
+            "p95": _percentile(values, 95),
+            "std": statistics.stdev(values) if len(values) > 1 else 0.0,
+        }
+
+    def statistics_row(label: str, values: list[float]) -> list[str]:
+        return [label, *(f"{value:.03f} ms" for value in summary(values).values())]
+
+    print(
+        format_table(
+            [
+                [
+                    f"Day {timer.day} ({runs} runs)",
+                    "min",
+                    "median",
+                    "mean",
+                    "p95",
+                    "std",
+                ],
+                *(statistics_row(*sample) for sample in samples[:-1]),
+            ],
+            statistics_row(*samples[-1]),
         )
+    )
+    metadata = run_metadata(timer.day)
+    report_records(
+        [
+            {"day": day_key(timer.day), "index": index, "section": label, "runs": runs}
+            | (stats := summary(values))
+            | {"ms": stats["median"]}
+            | metadata
+            for index, (label, values) in enumerate(samples)
+        ],
+        export or TIMER_EXPORT,
+        baseline or TIMER_BASELINE,
+        REGRESSION_THRESHOLD if threshold is None else threshold,
+    )
+    return samples
+
+
+def startup_report(
+    script: str | Path | None = None, budget_ms: float | None = None, top: int = 10
+) -> list[tuple[str, float]]:
+    """Print how long importing a day script takes, broken down per module.
+
+    The script is imported in a fresh interpreter with `-X importtime`, so its
+    main function does not run. The table lists the top level imports that
+    took longest including everything they imported themselves. Use it like
+
+        python -c "import aoc; aoc.startup_report('13.py', budget_ms=150)"
+
+    Args:
+        script (str | Path | None, optional): The day script, by default the
+            main script.
+        budget_ms (float | None, optional): The allowed total import time.
+        top (int, optional): How many modules are listed.
+
+    Returns:
+        list[tuple[str, float]]: Every top level module and its cumulative
+            import time in ms, slowest first.
+
+    Raises:
+        SystemExit: If the imports take longer than the budget.
+    """
+    import subprocess
+
+    script = Path(script or sys.argv[0]).resolve()
+    loader = (
+        "import importlib.util, sys;"
+        f"sys.argv[0] = {str(script)!r};"
+        f"sys.path.insert(0, {str(script.parent)!r});"
+        f"spec = importlib.util.spec_from_file_location('day', {str(script)!r});"
+        "spec.loader.exec_module(importlib.util.module_from_spec(spec))"
+    )
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", loader],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = []
+    for line in process.stderr.splitlines():
+        match = re.fullmatch(r"import time:\s+\d+ \|\s+(\d+) \| (\S.*)", line)
+        if match:
+            modules.append((match[2], int(match[1]) / 1000))
+    modules.sort(key=lambda module: module[1], reverse=True)
+    total = sum(duration for _, duration in modules)
+
+    rows = [[f"Imports of {script.name}", "cumulative"]]
+    rows.extend([name, f"{duration:.03f} ms"] for name, duration in modules[:top])
+    print(format_table(rows, ["Total", f"{total:.03f} ms"]))
+    if budget_ms is not None and total > budget_ms:
+        print(f"Budget> imports take {total:.03f} ms of {budget_ms:.03f} ms")
+        raise SystemExit(1)
+    return modules
+
+
+# ==============================================================================
+# Running all days
+
+
+class DayResult:
+    """The outcome of running the main function of one day script.
+
+    Attributes:
+        name (str): The script name without suffix, e.g. "08-alternate".
+        output (str): Everything the day printed.
+        durations (list[tuple[str, float]]): The timed sections in ms.
+        total (float): The total time in ms.
+        records (list[dict[str, any]]): The timing records for export.
+        error (str | None): The exception if the day failed.
+        cached (bool): Whether the output was taken from the answer cache.
+    """
+
+    name: str
+    output: str
+    durations: list[tuple[str, float]]
+    total: float
+    records: list[dict[str, any]]
+    error: str | None
+    cached: bool
+
+    def __init__(self, name: str, output: str = "", cached: bool = False):
+        self.name = name
+        self.output = output
+        self.durations = []
+        self.total = 0.0
+        self.records = []
+        self.error = None
+        self.cached = cached
+
 
-        print(bottomrule)
+def find_days(variants: bool = False) -> list[Path]:
+    """Find the day scripts next to the main script.
+
+    Args:
+        variants (bool, optional): Include scripts like `15-astar.py`. Some of
+            them plot or take command line arguments, so they are skipped by
+            default.
+
+    Returns:
+        list[Path]: The scripts sorted by name.
+    """
+    pattern = r"\d\d(-[\w-]+)?\.py" if variants else r"\d\d\.py"
+    return sorted(
+        path for path in PROJECT_FOLDER.glob("*.py") if re.fullmatch(pattern, path.name)
+    )
+
+
+def answer_key(path: Path) -> str | None:
+    """Hash everything the answers of a day script depend on.
+
+    That is the script, this module and the input of the day. Other modules
+    a script imports are not included.
+
+    Args:
+        path (Path): The day script.
+
+    Returns:
+        str | None: The hash, None if the input is not downloaded yet.
+    """
+    day = int(path.name[:2])
+    if not cache_file_for_day(day).exists():
+        return None
+    digest = hashlib.sha256(path.read_bytes())
+    digest.update(Path(__file__).read_bytes())
+    digest.update(input_hash(day).encode())
+    return digest.hexdigest()
+
+
+def answers_file() -> Path:
+    """The file the runner keeps the output of every day script in."""
+    return sidecar_directory() / "answers.json"
+
+
+def load_answers() -> dict[str, dict[str, str]]:
+    """Load the answer cache, a key and the output by script name."""
+    try:
+        return json.loads(answers_file().read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def store_answers(answers: dict[str, dict[str, str]]) -> None:
+    """Replace the answer cache atomically."""
+    path = answers_file()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomically(path, json.dumps(answers, indent=1).encode())
+
+
+def run_day(path: Path) -> DayResult:
+    """Import a day script and time its main function, capturing its output.
+
+    Args:
+        path (Path): The day script.
+
+    Returns:
+        DayResult: The result, with the error set if the day raised or exited.
+    """
+    global CURRENT_DAY
+    CURRENT_DAY = int(path.name[:2])
+    result = DayResult(path.stem)
+    output = io.StringIO()
+    try:
+        spec = importlib.util.spec_from_file_location(f"day_{path.stem}", path)
+        module = sys.modules[spec.name] = importlib.util.module_from_spec(spec)
+        with redirect_stdout(output):
+            spec.loader.exec_module(module)
+            with Timer(CURRENT_DAY, silent=True) as timer:
+                _call_main(module.main, timer)
+        flush_persistent_caches()
+        result.durations, result.total = timer.durations, timer.total
+        result.records = timer.records()
+        for record in result.records:
+            record["day"] = path.stem
+    except KeyboardInterrupt:
+        raise
+    except BaseException as exception:
+        # sys.exit or a failing argparse in one day must not end the others
+        result.error = f"{type(exception).__name__}: {exception}"
+    result.output = output.getvalue()
+    return result
+
+
+def run_days(paths: list[Path], workers: int | None = None) -> list[DayResult]:
+    """Run several days in a process pool.
+
+    Args:
+        paths (list[Path]): The day scripts.
+        workers (int | None, optional): The number of processes, by default
+            one per CPU.
+
+    Returns:
+        list[DayResult]: The results in the order of the paths.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run_day, paths))
+
+
+def runner(arguments: list[str] | None = None) -> int:
+    """Run days in parallel and print their output and a combined report.
+
+    The report lists the total of every day with its sections below it, and
+    the wall time of the whole run. Timing records get exported and compared
+    to a baseline like for Timer.
+
+    The output of every day is cached together with its answer_key. Days
+    whose script, input and this module did not change are not run again
+    but print their cached output, unless `--force` is given. The days that
+    did run are listed after the report.
+
+    Args:
+        arguments (list[str] | None, optional): The command line arguments.
+
+    Returns:
+        int: The exit status, 1 if a day failed.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run advent of code days.")
+    parser.add_argument("days", type=int, nargs="*", help="days to run, or all")
+    parser.add_argument("-j", "--workers", type=int, help="number of processes")
+    parser.add_argument(
+        "--variants", action="store_true", help="include scripts like 15-astar.py"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="run days with cached answers as well"
+    )
+    args = parser.parse_args(arguments)
+
+    paths = [
+        path
+        for path in find_days(args.variants)
+        if not args.days or int(path.name[:2]) in args.days
+    ]
+    answers = load_answers()
+    results = {}
+    for path in paths:
+        answer = answers.get(path.stem)
+        if not args.force and answer and answer["key"] == answer_key(path):
+            results[path] = DayResult(path.stem, answer["output"], cached=True)
+    stale = [path for path in paths if path not in results]
+
+    start = time.perf_counter_ns()
+    results |= zip(stale, run_days(stale, args.workers))
+    wall_time = (time.perf_counter_ns() - start) / 1e6
+
+    for path in stale:
+        if results[path].error is None and (key := answer_key(path)):
+            answers[path.stem] = {"key": key, "output": results[path].output}
+    if stale:
+        store_answers(answers)
+    results = [results[path] for path in paths]
+
+    rows = [["Days", f"{len(results)} on {args.workers or os.cpu_count()} cores"]]
+    for result in results:
+        print(f"━━ {result.name} ━━")
+        print(result.output, end="")
+        if result.error is not None:
+            print("Error>", result.error)
+            rows.append([result.name, "failed"])
+            continue
+        if result.cached:
+            rows.append([result.name, "cached"])
+            continue
+        rows.append([result.name, f"{result.total:.03f} ms"])
+        if len(result.durations) > 1:
+            rows.extend(
+                [f"  {label}", f"{duration:.03f} ms"]
+                for label, duration in result.durations
+            )
+    rows.append(["Sum of days", f"{sum(result.total for result in results):.03f} ms"])
+    print(format_table(rows, ["Wall time", f"{wall_time:.03f} ms"]))
+    print("Recomputed>", ", ".join(path.stem for path in stale) or "nothing")
+    report_records(
+        [record for result in results for record in result.records],
+        TIMER_EXPORT,
+        TIMER_BASELINE,
+        REGRESSION_THRESHOLD,
+    )
+    return int(any(result.error is not None for result in results))
+
+
+if __name__ == "__main__":
+    # Import this file as `aoc` so the pool workers and the days share it.
+    import aoc
+
+    sys.exit(aoc.runner())
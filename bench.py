@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""Measure how the runtime and memory of the days scale with their input size.
+
+Every day with an input of variable size has a generator below that writes a
+random but valid input of a given size, e.g. the side of a grid, the number of
+lines or the number of scanners. The sizes start at the base size of the
+generator and double for every step. Every size is solved in a fresh
+interpreter with the generated inputs in a temporary input directory, so the
+real inputs and their caches are left alone:
+
+    ./bench.py # all days, four sizes each
+    ./bench.py 9 22 --steps 6 --timeout 120
+
+For every day a table lists the runtime, the peak resident memory and the
+slope of the runtime over the size n on a log-log scale. It is about 1 if the
+runtime grows linearly with n and about 2 if it grows quadratically, so a
+linear solution over a grid of side n already has a slope of 2. The fitted
+slope over all sizes is in the footer and `--max-slope` turns it into a
+check. The timing records get exported and compared like for aoc.Timer, see
+$AOC_TIMER_EXPORT and $AOC_TIMER_BASELINE, with one section per size.
+"""
+
+import argparse
+import itertools
+import json
+import math
+import random
+import resource
+import signal
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+import aoc
+
+GENERATOR = Callable[[int, random.Random], str]
+GENERATORS: dict[int, tuple[GENERATOR, int]] = {}
+FIXED_SIZE_DAYS = {
+    21: "the input is just the two starting positions",
+    23: "the burrow always has the same shape",
+    24: "the program always checks fourteen digits",
+}
+SEGMENTS = ["abcefg", "cf", "acdeg", "acdfg", "bcdf", "abdfg", "abdefg", "acf"]
+SEGMENTS += ["abcdefg", "abcdfg"]
+BRACKETS = {"(": ")", "[": "]", "{": "}", "<": ">"}
+EVEN_PERMUTATIONS = [(0, 1, 2), (1, 2, 0), (2, 0, 1)]
+
+
+def generator(day: int, base_size: int) -> Callable[[GENERATOR], GENERATOR]:
+    """Register an input generator for a day with the smallest size to run."""
+
+    def register(function: GENERATOR) -> GENERATOR:
+        GENERATORS[day] = function, base_size
+        return function
+
+    return register
+
+
+def digit_grid(side: int, rng: random.Random, digits: str = "0123456789") -> str:
+    return "\n".join("".join(rng.choices(digits, k=side)) for _ in range(side)) + "\n"
+
+
+@generator(1, 2000)
+def sonar_sweep(lines: int, rng: random.Random) -> str:
+    depth = 100
+    depths = []
+    for _ in range(lines):
+        depth = max(0, depth + rng.randint(-5, 10))
+        depths.append(str(depth))
+    return "\n".join(depths) + "\n"
+
+
+@generator(2, 1000)
+def commands(lines: int, rng: random.Random) -> str:
+    return "".join(
+        f"{rng.choice(['forward', 'down', 'up'])} {rng.randint(1, 9)}\n"
+        for _ in range(lines)
+    )
+
+
+@generator(3, 1024)
+def diagnostic_report(lines: int, rng: random.Random) -> str:
+    return "".join(f"{rng.getrandbits(64):064b}\n" for _ in range(lines))
+
+
+@generator(4, 100)
+def bingo(boards: int, rng: random.Random) -> str:
+    draws = rng.sample(range(100), 100)
+    text = ",".join(map(str, draws)) + "\n"
+    for _ in range(boards):
+        numbers = rng.sample(range(100), 25)
+        text += "\n" + "".join(
+            " ".join(f"{number:2d}" for number in numbers[row : row + 5]) + "\n"
+            for row in range(0, 25, 5)
+        )
+    return text
+
+
+@generator(5, 500)
+def vents(lines: int, rng: random.Random) -> str:
+    text = ""
+    for _ in range(lines):
+        x1, y1 = rng.randrange(1000), rng.randrange(1000)
+        dx, dy = rng.choice([(1, 0), (0, 1), (1, 1), (1, -1)])
+        room = min(999 - x1 if dx else 999, {1: 999 - y1, 0: 999, -1: y1}[dy])
+        length = rng.randint(0, min(300, room))
+        text += f"{x1},{y1} -> {x1 + dx * length},{y1 + dy * length}\n"
+    return text
+
+
+@generator(6, 300)
+def lanternfish(fish: int, rng: random.Random) -> str:
+    return ",".join(str(rng.randint(1, 5)) for _ in range(fish)) + "\n"
+
+
+@generator(7, 125)
+def crabs(count: int, rng: random.Random) -> str:
+    # the descent oscillates on the flat minimum an even number of crabs has
+    return ",".join(str(rng.randrange(2000)) for _ in range(count | 1)) + "\n"
+
+
+@generator(8, 200)
+def displays(lines: int, rng: random.Random) -> str:
+    text = ""
+    for _ in range(lines):
+        wiring = dict(zip("abcdefg", rng.sample("abcdefg", 7)))
+
+        def scramble(digit: int) -> str:
+            wires = [wiring[segment] for segment in SEGMENTS[digit]]
+            return "".join(rng.sample(wires, len(wires)))
+
+        patterns = [scramble(digit) for digit in rng.sample(range(10), 10)]
+        outputs = [scramble(rng.randrange(10)) for _ in range(4)]
+        text += " ".join(patterns) + " | " + " ".join(outputs) + "\n"
+    return text
+
+
+@generator(9, 50)
+def heightmap(side: int, rng: random.Random) -> str:
+    # ridges of 9s every few rows and columns cut the map into many basins
+    ridge_rows = set(range(rng.randint(3, 8), side, 8))
+    ridge_columns = set(range(rng.randint(3, 8), side, 8))
+    return "".join(
+        "".join(
+            "9" if y in ridge_rows or x in ridge_columns else rng.choice("012345678")
+            for x in range(side)
+        )
+        + "\n"
+        for y in range(side)
+    )
+
+
+@generator(10, 100)
+def navigation(lines: int, rng: random.Random) -> str:
+    text = ""
+    for _ in range(lines):
+        line, expected = "", []
+        for _ in range(rng.randint(20, 100)):
+            if expected and rng.random() < 0.4:
+                line += expected.pop()
+            else:
+                opening = rng.choice(list(BRACKETS))
+                line += opening
+                expected.append(BRACKETS[opening])
+        if rng.random() < 0.5:  # corrupt the line
+            position = rng.randrange(len(line))
+            line = line[:position] + rng.choice(list(BRACKETS.values()))
+        text += line + "\n"
+    return text
+
+
+@generator(11, 10)
+def octopuses(side: int, rng: random.Random) -> str:
+    # random grids may never flash all at once, equal energies flash together
+    return digit_grid(side, rng, str(rng.randrange(10)))
+
+
+@generator(12, 4)
+def caves(length: int, rng: random.Random) -> str:
+    # the number of paths explodes with branching, a chain grows polynomially
+    names = ["start"] + [f"c{index}" for index in range(length)] + ["end"]
+    return "".join(f"{a}-{b}\n" for a, b in itertools.pairwise(names))
+
+
+@generator(13, 200)
+def transparent_paper(points: int, rng: random.Random) -> str:
+    width, height, folds = 40, 6, []
+    while width * height < 4 * points:
+        folds += [("x", width), ("y", height)]
+        width, height = 2 * width + 1, 2 * height + 1
+    text = "".join(
+        f"{rng.randrange(width)},{rng.randrange(height)}\n" for _ in range(points)
+    )
+    return text + "\n" + "".join(f"fold along {a}={d}\n" for a, d in folds[::-1])
+
+
+@generator(14, 20)
+def polymer(length: int, rng: random.Random) -> str:
+    letters = "BCFHKNOPSV"
+    text = "".join(rng.choices(letters, k=length)) + "\n\n"
+    return text + "".join(
+        f"{a}{b} -> {rng.choice(letters)}\n"
+        for a, b in itertools.product(letters, letters)
+    )
+
+
+@generator(15, 25)
+def chitons(side: int, rng: random.Random) -> str:
+    return digit_grid(side, rng, "123456789")
+
+
+@generator(16, 50)
+def transmission(literals: int, rng: random.Random) -> str:
+    def literal() -> str:
+        value = f"{rng.randrange(2**16):016b}"
+        groups = [value[index : index + 4] for index in range(0, 16, 4)]
+        return f"{rng.randrange(8):03b}100" + "".join(
+            ("0" if index == 3 else "1") + group for index, group in enumerate(groups)
+        )
+
+    def packet_sum(packets: list[str]) -> str:
+        return f"{rng.randrange(8):03b}0001{len(packets):011b}" + "".join(packets)
+
+    packets = [literal() for _ in range(literals)]
+    while len(packets) > 1:
+        packets = [
+            packet_sum(packets[index : index + 2047])
+            for index in range(0, len(packets), 2047)
+        ]
+    bits = packets[0] + "0" * (-len(packets[0]) % 4)
+    return f"{int(bits, 2):0{len(bits) // 4}X}\n"
+
+
+@generator(17, 25)
+def target_area(distance: int, rng: random.Random) -> str:
+    return (
+        f"target area: x={distance}..{2 * distance},"
+        f" y={-2 * distance}..{-distance}\n"
+    )
+
+
+@generator(18, 25)
+def snailfish(lines: int, rng: random.Random) -> str:
+    def number(depth: int) -> str:
+        if depth == 4 or depth > 0 and rng.random() < 0.3:
+            return str(rng.randrange(10))
+        return f"[{number(depth + 1)},{number(depth + 1)}]"
+
+    return "".join(number(0) + "\n" for _ in range(lines))
+
+
+@generator(19, 4)
+def scanners(count: int, rng: random.Random) -> str:
+    # scanners sit in a row 1000 apart, so neighbours share about 30 beacons
+    positions = [(1000 * index, 0, 0) for index in range(count)]
+    beacons = {
+        tuple(p + rng.randint(-1000, 1000) for p in position)
+        for position in positions
+        for _ in range(30)
+    }
+    text = []
+    for index, position in enumerate(positions):
+        a, b, c = rng.sample(range(3), 3)
+        signs = [rng.choice([-1, 1]) for _ in range(2)]
+        signs.append(signs[0] * signs[1])
+        if (a, b, c) not in EVEN_PERMUTATIONS:
+            signs[0] *= -1  # a rotation, not a reflection
+        visible = [
+            [q - p for p, q in zip(position, beacon)]
+            for beacon in beacons
+            if all(abs(q - p) <= 1000 for p, q in zip(position, beacon))
+        ]
+        rng.shuffle(visible)
+        text.append(
+            f"--- scanner {index} ---\n"
+            + "".join(
+                f"{signs[0] * v[a]},{signs[1] * v[b]},{signs[2] * v[c]}\n"
+                for v in visible
+            )
+        )
+    return "\n".join(text)
+
+
+@generator(20, 20)
+def trench_map(side: int, rng: random.Random) -> str:
+    # like the real algorithms: an infinite dark area lights up and back again
+    algorithm = "#" + "".join(rng.choices(".#", k=510)) + "."
+    return algorithm + "\n\n" + digit_grid(side, rng, ".#")
+
+
+@generator(22, 50)
+def reactor_reboot(steps: int, rng: random.Random) -> str:
+    text = ""
+    for step in range(steps):
+        extent = 50 if step < steps // 2 else 100_000
+        state = "on" if step == 0 or rng.random() < 0.7 else "off"
+        ranges = []
+        for _ in range(3):
+            low = rng.randint(-extent, extent // 2)
+            ranges.append(f"{low}..{low + rng.randint(1, extent // 2)}")
+        text += f"{state} x={ranges[0]},y={ranges[1]},z={ranges[2]}\n"
+    return text
+
+
+@generator(25, 20)
+def sea_cucumbers(side: int, rng: random.Random) -> str:
+    return (
+        "\n".join(
+            "".join(rng.choices(".>v", weights=(4, 3, 3), k=side)) for _ in range(side)
+        )
+        + "\n"
+    )
+
+
+def measure(script: Path, directory: Path) -> None:
+    """Solve a day with the inputs of a directory and print the result as JSON.
+
+    This runs in the interpreter started by solve, so the peak memory is the
+    one of this day only.
+    """
+    aoc.CACHE_DIRECTORY = directory
+    result = aoc.run_day(script)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(
+        json.dumps(
+            {
+                "total": result.total,
+                "error": result.error,
+                "record": result.records[-1] if result.records else None,
+                "peak_bytes": peak * (1 if sys.platform == "darwin" else 1024),
+            }
+        )
+    )
+
+
+def solve(script: Path, directory: Path, timeout: float) -> dict[str, any]:
+    """Solve a day in a fresh interpreter, see measure."""
+    try:
+        process = subprocess.run(
+            [sys.executable, __file__, "--measure", str(script), str(directory)],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return {"error": f"timeout after {timeout:g} s"}
+    if process.returncode:
+        # a process killed by a signal may not have written anything
+        if lines := process.stderr.strip().splitlines():
+            return {"error": lines[-1]}
+        if process.returncode < 0:
+            return {"error": f"killed by {signal.Signals(-process.returncode).name}"}
+        return {"error": f"exit status {process.returncode}"}
+    return json.loads(process.stdout)
+
+
+def slope(sizes: list[int], durations: list[float]) -> float:
+    """The least squares slope of the durations over the sizes, log-log."""
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(duration, 1e-3)) for duration in durations]
+    x_mean, y_mean = sum(xs) / len(xs), sum(ys) / len(ys)
+    variance = sum((x - x_mean) ** 2 for x in xs)
+    return sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) / variance
+
+
+def benchmark_day(
+    day: int, steps: int, timeout: float, seed: int
+) -> tuple[list[dict[str, any]], float | None]:
+    """Run a day at doubling sizes and print the scaling table.
+
+    Returns:
+        tuple[list[dict[str, any]], float | None]: The timing records and the
+            fitted slope, None if fewer than two sizes finished.
+    """
+    function, base_size = GENERATORS[day]
+    script = aoc.PROJECT_FOLDER / f"{day:02d}.py"
+    rows = [[f"Day {day:02d} {function.__name__}", "bytes", "time", "peak", "slope"]]
+    records, sizes, durations = [], [], []
+    with tempfile.TemporaryDirectory() as directory:
+        for step in range(steps):
+            size = base_size * 2**step
+            text = function(size, random.Random(f"{seed}-{day}-{size}"))
+            input_file = Path(directory) / aoc.CACHE_FILE_NAME_TEMPLATE.format(day)
+            input_file.write_text(text)
+            result = solve(script, Path(directory), timeout)
+            if result["error"] is not None:
+                rows.append([f"n={size}", str(len(text)), result["error"], "", ""])
+                break
+            sizes.append(size)
+            durations.append(result["total"])
+            local_slope = slope(sizes[-2:], durations[-2:]) if step else None
+            rows.append(
+                [
+                    f"n={size}",
+                    str(len(text)),
+                    f"{result['total']:.03f} ms",
+                    aoc.format_bytes(result["peak_bytes"]),
+                    "" if local_slope is None else f"{local_slope:.2f}",
+                ]
+            )
+            records.append(
+                result["record"]
+                | {"day": f"{day:02d}", "index": step, "section": f"n={size}"}
+                | {"rss_bytes": result["peak_bytes"]}
+            )
+    fitted = slope(sizes, durations) if len(sizes) > 1 else None
+    footer = ["Fitted slope", "", "", "", "" if fitted is None else f"{fitted:.2f}"]
+    if len(rows) == 2:  # format_table hides a body of a single row
+        rows.append([""] * 5)
+    print(aoc.format_table(rows, footer))
+    return records, fitted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("days", type=int, nargs="*", help="days to run, or all")
+    parser.add_argument("--steps", type=int, default=4, help="sizes per day")
+    parser.add_argument(
+        "--timeout", type=float, default=60, help="seconds per size until giving up"
+    )
+    parser.add_argument("--seed", type=int, default=2021, help="for the generators")
+    parser.add_argument(
+        "--max-slope", type=float, help="fail if a day scales worse than this"
+    )
+    parser.add_argument("--measure", nargs=2, type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(*args.measure)
+        return
+
+    records, too_steep = [], []
+    for day in args.days or sorted([*GENERATORS, *FIXED_SIZE_DAYS]):
+        if day in FIXED_SIZE_DAYS:
+            print(f"Day {day:02d} skipped, {FIXED_SIZE_DAYS[day]}")
+            continue
+        day_records, fitted = benchmark_day(day, args.steps, args.timeout, args.seed)
+        records += day_records
+        if args.max_slope is not None and fitted is not None:
+            if fitted > args.max_slope:
+                too_steep.append(f"Day {day:02d} scales with slope {fitted:.2f}")
+    aoc.report_records(
+        records, aoc.TIMER_EXPORT, aoc.TIMER_BASELINE, aoc.REGRESSION_THRESHOLD
+    )
+    for message in too_steep:
+        print("Regression>", message)
+    if too_steep:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
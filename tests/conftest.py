@@ -0,0 +1,20 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import aoc
+
+
+@pytest.fixture
+def write_input(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Write the input of a day into a temporary input directory."""
+    monkeypatch.setattr(aoc, "CACHE_DIRECTORY", tmp_path)
+
+    def write(content: str, day: int = 1) -> int:
+        aoc.cache_file_for_day(day).write_bytes(content.encode())
+        return day
+
+    return write
@@ -0,0 +1,55 @@
+import importlib.util
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture(scope="module")
+def alternate():
+    # registered in sys.modules so the worker processes can unpickle its functions
+    path = Path(__file__).parent.parent / "02-alternate.py"
+    spec = importlib.util.spec_from_file_location("day02_alternate", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    yield module
+    del sys.modules[spec.name]
+
+
+def walk(commands: list[tuple[str, int]], part: int) -> list[tuple[int, int]]:
+    """The (position, depth) after every command, one command at a time."""
+    position = depth = aim = 0
+    positions = []
+    for command, distance in commands:
+        if command == "f":
+            position += distance
+            depth += distance * aim if part == 2 else 0
+        else:
+            change = distance if command == "d" else -distance
+            if part == 1:
+                depth += change
+            else:
+                aim += change
+        positions.append((position, depth))
+    return positions
+
+
+@pytest.fixture
+def commands() -> list[tuple[str, int]]:
+    rng = random.Random(0)
+    return [(rng.choice("fdu"), rng.randint(1, 9)) for _ in range(1001)]
+
+
+@pytest.mark.parametrize("part", [1, 2])
+@pytest.mark.parametrize("workers", [1, 3])
+def test_trajectory_matches_a_plain_walk(
+    alternate, monkeypatch, commands, part, workers
+):
+    monkeypatch.setattr(alternate, "PARALLEL_THRESHOLD", 10)
+    positions = alternate.trajectory(commands, part, workers)
+    assert positions.tolist() == [list(p) for p in walk(commands, part)]
+    final = alternate.final_position(commands, part, workers)
+    assert np.array_equal(final, positions[-1])
@@ -0,0 +1,47 @@
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture(scope="module")
+def day03():
+    path = Path(__file__).parent.parent / "03.py"
+    spec = importlib.util.spec_from_file_location("day03", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def rates(report: list[str]) -> tuple[int, int]:
+    """Gamma and epsilon, one column at a time."""
+    gamma = epsilon = ""
+    for column in zip(*report):
+        ones = column.count("1")
+        gamma += "1" if ones / len(report) >= 0.5 else "0"
+        epsilon += "1" if ones / len(report) < 0.5 and ones != 0 else "0"
+    return int(gamma, 2), int(epsilon, 2)
+
+
+EXAMPLE = "00100 11110 10110 10111 10101 01111 00111 11100 10000 11001 00010 01010"
+
+
+@pytest.mark.parametrize(
+    "report",
+    [
+        EXAMPLE.split(),
+        ["0010", "0011", "0110"],  # first column only 0s
+        ["1010", "1011", "1110"],  # first column only 1s
+        ["10", "01"],  # ties
+        ["0000"],
+    ],
+)
+def test_power_rates_count_every_column(day03, report):
+    digits = np.array([[int(digit) for digit in line] for line in report])
+    assert day03.power_rates(digits) == rates(report)
+
+
+def test_power_rates_example(day03):
+    digits = np.array([[int(digit) for digit in line] for line in EXAMPLE.split()])
+    assert day03.power_rates(digits) == (22, 9)
@@ -0,0 +1,41 @@
+import sys
+
+import aoc
+
+SOURCE = """
+calls = []
+
+def square(value):
+    calls.append(value)
+    return value * value
+"""
+
+
+def defined_interactively() -> tuple[list, aoc.PersistentCache]:
+    namespace = {}
+    exec(compile(SOURCE, "<stdin>", "exec"), namespace)
+    return namespace["calls"], aoc.persistent_cache(namespace["square"])
+
+
+def test_persistent_cache_without_source_or_day(tmp_path, monkeypatch):
+    monkeypatch.setattr(aoc, "CACHE_DIRECTORY", tmp_path)
+    monkeypatch.setattr(aoc, "CURRENT_DAY", None)
+    monkeypatch.setattr(sys, "argv", ["-c"])
+    calls, square = defined_interactively()
+    assert square(3) == 9
+    square.flush()
+    assert square._namespace.count(":") == 1
+    calls, square = defined_interactively()
+    assert square(3) == 9
+    assert calls == []
+
+
+def test_persistent_cache_keys_by_the_input_of_a_known_day(
+    tmp_path, monkeypatch, write_input
+):
+    monkeypatch.setattr(aoc, "CURRENT_DAY", 1)
+    write_input("1")
+    _, square = defined_interactively()
+    assert square(3) == 9
+    square.flush()
+    assert square._namespace.endswith(aoc.input_hash(1)[:16])
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+import aoc
+
+
+def grid_edges(costs: np.ndarray) -> list[list[tuple[int, int]]]:
+    """The edges of a 4-connected grid, computed one cell at a time."""
+    height, width = costs.shape
+    edges = []
+    for y in range(height):
+        for x in range(width):
+            edges.append(
+                [
+                    ((y + dy) * width + x + dx, int(costs[y + dy, x + dx]))
+                    for dy, dx in aoc.Grid.OFFSETS[4]
+                    if 0 <= y + dy < height and 0 <= x + dx < width
+                ]
+            )
+    return edges
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (1, 7), (5, 1), (300, 301)])
+def test_from_grid_matches_the_neighbours(shape):
+    costs = np.random.default_rng(0).integers(1, 10, shape)
+    graph = aoc.Graph.from_grid(costs)
+    assert graph.size == costs.size
+    expected = grid_edges(costs)
+    assert [list(graph.edges(node)) for node in range(graph.size)] == expected
+
+
+def test_from_edges_matches_from_grid():
+    costs = np.random.default_rng(1).integers(1, 10, (20, 30))
+    expected = grid_edges(costs)
+    sources = [node for node, edges in enumerate(expected) for _ in edges]
+    targets = [target for edges in expected for target, _ in edges]
+    order = np.random.default_rng(2).permutation(len(sources))
+    graph = aoc.Graph.from_edges(
+        costs.size,
+        np.array(sources)[order],
+        np.array(targets)[order],
+        costs.ravel()[np.array(targets)[order]],
+    )
+    grid = aoc.Graph.from_grid(costs)
+    for node in range(costs.size):
+        assert sorted(graph.edges(node)) == sorted(grid.edges(node))
+
+
+def test_searches_agree():
+    costs = np.random.default_rng(3).integers(1, 10, (40, 40))
+    graph = aoc.Graph.from_grid(costs)
+    goal = costs.size - 1
+    distance = aoc.dijkstra(graph, 0)
+    assert aoc.dijkstra(graph, 0, goal) == distance[goal]
+    assert aoc.bucket_dijkstra(graph, 0, goal) == distance[goal]
+    assert aoc.astar(graph, 0, goal, heuristic=lambda node: 0) == distance[goal]
+    assert aoc.bfs(graph, 0, goal) == 78
+
+
+def test_state_graph_matches_graph():
+    costs = np.random.default_rng(4).integers(1, 10, (15, 15))
+    height, width = costs.shape
+
+    def moves(state):
+        y, x = state
+        for dy, dx in aoc.Grid.OFFSETS[4]:
+            if 0 <= y + dy < height and 0 <= x + dx < width:
+                yield (y + dy, x + dx), int(costs[y + dy, x + dx])
+
+    expected = aoc.dijkstra(aoc.Graph.from_grid(costs), 0, costs.size - 1)
+    graph = aoc.StateGraph(moves)
+    start = graph.node((0, 0))
+    goal = (height - 1, width - 1)
+    assert aoc.dijkstra(graph, start, lambda node: graph.states[node] == goal) == (
+        expected
+    )
+    graph = aoc.StateGraph(moves)
+    assert (
+        aoc.bucket_dijkstra(
+            graph, graph.node((0, 0)), lambda node: graph.states[node] == goal, 9
+        )
+        == expected
+    )
@@ -0,0 +1,37 @@
+import pickle
+
+import aoc
+
+
+def test_memoize_binds_methods():
+    class Counter:
+        def __init__(self, step: int):
+            self.step = step
+            self.calls = 0
+
+        @aoc.memoize
+        def times(self, count: int) -> int:
+            self.calls += 1
+            return self.step * count
+
+    first, second = Counter(2), Counter(3)
+    assert first.times(4) == 8 and first.times(4) == 8
+    assert second.times(4) == 12
+    assert first.calls == 1 and second.calls == 1
+    assert Counter.times.store.hits == 1
+
+
+def test_memoize_keeps_keywords_apart_from_positional_arguments():
+    @aoc.memoize
+    def arguments(*args, **kwargs) -> tuple:
+        return args, kwargs
+
+    assert arguments(1, b=2) == ((1,), {"b": 2})
+    assert arguments((1,), (("b", 2),)) == (((1,), (("b", 2),)), {})
+    assert arguments(1, b=2) == ((1,), {"b": 2})
+    assert arguments.store.hits == 1
+
+
+def test_keyword_mark_survives_pickling():
+    key = (1, aoc._KEYWORD_MARK, ("b", 2))
+    assert pickle.loads(pickle.dumps(key)) == key
@@ -0,0 +1,111 @@
+import threading
+
+import numpy as np
+import pytest
+
+import aoc
+
+INPUTS = {
+    "lf": "1,2,3\n\nab\ncd\n\n4\n5\n",
+    "crlf": "1,2,3\r\n\r\nab\r\ncd\r\n\r\n4\r\n5\r\n",
+    "blank runs": "1,2,3\n\n\n\nab\ncd\n\n\n4\n5\n",
+    "crlf blank runs": "\r\n1,2,3\r\n\r\n\r\nab\r\ncd\r\n\r\n\r\n\r\n4\r\n5\r\n\r\n",
+}
+
+
+def both_modes(write_input, content: str, chain) -> list:
+    """Parse the content in lines and mmap mode and check they agree."""
+    day = write_input(content)
+    results = [chain(aoc.Parse(day, mmap=mmap)) for mmap in (False, True)]
+    assert repr(results[0]) == repr(results[1])
+    return results[0]
+
+
+@pytest.mark.parametrize("content", INPUTS.values(), ids=INPUTS.keys())
+def test_mapped_lines_sections(write_input, content):
+    sections = both_modes(
+        write_input,
+        content,
+        lambda parse: list(parse.comma_integers().lines().integers()),
+    )
+    assert sections == [[1, 2, 3], ["ab", "cd"], [4, 5]]
+
+
+@pytest.mark.parametrize("content", INPUTS.values(), ids=INPUTS.keys())
+def test_mapped_lines_raw_sections(write_input, content):
+    sections = both_modes(
+        write_input,
+        content,
+        lambda parse: list(parse.line().char_grid().remaining_lines()),
+    )
+    assert sections[0] == "1,2,3"
+    assert (sections[1] == np.array([[97, 98], [99, 100]])).all()
+    assert sections[2] == ["4", "5"]
+
+
+COLUMN_INPUTS = {
+    "empty section": ("1,2", r"(\d+) (\d+)", (int, int)),
+    "non-ascii": ("1,2\n\nä 1\nöü 22", r"(\S+) (\d+)", (str, int)),
+    "beyond int64": (
+        "1,2\n\n99999999999999999999 1\n-5 2",
+        r"(-?\d+) (\d+)",
+        (int, int),
+    ),
+    "blank runs": ("1,2\n\n\n\n3 4\n5 6", r"(\d+) (\d+)", (int, int)),
+    "crlf blank runs": ("1,2\r\n\r\n\r\n3 4\r\n5 6\r\n", r"(\d+) (\d+)", (int, int)),
+}
+
+
+@pytest.mark.parametrize(
+    "content,query,data_types", COLUMN_INPUTS.values(), ids=COLUMN_INPUTS.keys()
+)
+def test_regex_columns_match_regex_lines(write_input, content, query, data_types):
+    _, columns = both_modes(
+        write_input,
+        content,
+        lambda parse: list(parse.comma_integers().regex_columns(query, data_types)),
+    )
+    day = write_input(content)
+    records = aoc.Parse(day).comma_integers().regex_lines(query, data_types)[1]
+    assert len(columns) == len(data_types)
+    assert [list(row) for row in zip(*columns)] == records
+
+
+OFFSET = 0
+
+
+def make_converter(offset: int):
+    return lambda value: int(value) + offset
+
+
+def shifted(value: str, offset: int = 0) -> int:
+    return int(value) + offset + OFFSET
+
+
+def cached_parse(day: int, converter) -> list:
+    parse = aoc.Parse(day, cache=True)
+    return parse.regex_lines(r"(\d+),(\d+)", (converter, int)).get()
+
+
+def test_cache_keys_closures_by_their_contents(write_input):
+    day = write_input("1,2\n3,4")
+    assert cached_parse(day, make_converter(2)) == [[3, 2], [5, 4]]
+    assert cached_parse(day, make_converter(3)) == [[4, 2], [6, 4]]
+    assert cached_parse(day, make_converter(2)) == [[3, 2], [5, 4]]
+
+
+def test_cache_keys_functions_by_defaults_and_globals(write_input, monkeypatch):
+    day = write_input("1,2\n3,4")
+    assert cached_parse(day, shifted) == [[1, 2], [3, 4]]
+    monkeypatch.setattr(shifted, "__defaults__", (10,))
+    assert cached_parse(day, shifted) == [[11, 2], [13, 4]]
+    monkeypatch.setitem(globals(), "OFFSET", 100)
+    assert cached_parse(day, shifted) == [[111, 2], [113, 4]]
+
+
+def test_cache_skips_converters_it_can_not_describe(write_input):
+    day = write_input("1,2\n3,4")
+    lock = threading.Lock()
+    converter = lambda value: int(value) + lock.locked()
+    assert cached_parse(day, converter) == [[1, 2], [3, 4]]
+    assert not list(aoc.sidecar_directory().glob("*"))
@@ -0,0 +1,24 @@
+import aoc
+
+SCRIPTS = {
+    "01.py": "def main():\n    print('fine')\n",
+    "02.py": "import sys\n\ndef main():\n    sys.exit(3)\n",
+    "03.py": (
+        "import argparse\n\n"
+        "def main():\n"
+        "    argparse.ArgumentParser().parse_args(['--unknown'])\n"
+    ),
+}
+
+
+def test_days_that_exit_fail_alone(tmp_path, monkeypatch):
+    monkeypatch.setattr(aoc, "CURRENT_DAY", None)
+    paths = []
+    for name, source in SCRIPTS.items():
+        paths.append(tmp_path / name)
+        paths[-1].write_text(source)
+    results = aoc.run_days(paths, workers=1)
+    assert [result.name for result in results] == ["01", "02", "03"]
+    assert results[0].error is None and results[0].output == "fine\n"
+    assert results[1].error == "SystemExit: 3"
+    assert results[2].error == "SystemExit: 2"
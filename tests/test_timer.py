@@ -0,0 +1,26 @@
+import aoc
+
+
+def work(values: list[int]) -> int:
+    values.append(len(values))
+    return sum(value * value for value in range(10_000))
+
+
+def test_profiles_leave_out_the_timer(tmp_path):
+    values = []
+    with aoc.Timer(
+        day=1, silent=True, memory=True, profile=True, profile_dump=tmp_path
+    ) as timer:
+        work(values)
+        timer.mark()
+        work(values)
+    assert len(timer.profiles) == 2
+    for stats in timer.profiles:
+        names = {name for _, _, name in stats.stats}
+        assert "work" in names
+        assert not names & {"__exit__", "mark", "_end_section", "_stop_profiler"}
+        assert not any("disable" in name or "tracemalloc" in name for name in names)
+        appends = [key for key in stats.stats if "append" in key[2]]
+        assert [stats.stats[key][1] for key in appends] == [1]
+    for collapsed in tmp_path.glob("*.collapsed"):
+        assert "__exit__" not in collapsed.read_text()